@@ -1,6 +1,7 @@
 """Parent Class for the Specify Network API services."""
 from logging import INFO
 import os
+import time
 from werkzeug.exceptions import BadRequest
 
 from flask_app.common.base import _SpecifyNetworkService
@@ -163,8 +164,7 @@ class _AnalystService(_SpecifyNetworkService):
         retries = 0
         interval = 6
         while not os.path.exists(filename) and retries < 10:
-            import time
-            time.sleep(6)
+            time.sleep(interval)
             retries += 1
         if not os.path.exists(filename):
             success = False
@@ -39,9 +39,11 @@ class DWCA:
     DELIMITER_KEY = "fieldsTerminatedBy"
     LINE_DELIMITER_KEY = "linesTerminatedBy"
     QUOTE_CHAR_KEY = "fieldsEnclosedBy"
+    HEADER_LINES_KEY = "ignoreHeaderLines"
     LOCATION_KEY = "location"
     UUID_KEY = "id"
     FLDMAP_KEY = "fieldname_index_map"
+    IDXMAP_KEY = "index_fieldname_map"
     FLDS_KEY = "fieldnames"
     CORE_FIELDS_OF_INTEREST = [
         "id",
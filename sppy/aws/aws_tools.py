@@ -4,14 +4,16 @@
 # --------------------------------------------------------------------------------------
 import base64
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, SSLError
 import csv
 import certifi
 import datetime as DT
 from http import HTTPStatus
 from io import BytesIO
-import json
 from logging import ERROR
+import mimetypes
+import orjson
 import pandas as pd
 import os
 import requests
@@ -23,6 +25,11 @@ from sppy.aws.aws_constants import (
     SECURITY_GROUP_ID, SPOT_TEMPLATE_BASENAME, SUMMARY_FOLDER, USER_DATA_TOKEN)
 from sppy.tools.util.logtools import logit
 
+# Upload large files in 16 MB parts, sending up to 16 parts in parallel
+UPLOAD_CONFIG = TransferConfig(
+    multipart_threshold=8 << 20, multipart_chunksize=16 << 20, max_concurrency=16,
+    use_threads=True)
+
 
 # --------------------------------------------------------------------------------------
 # Methods for constructing and instantiating EC2 instances
@@ -452,13 +459,23 @@ def upload_to_s3(full_filename, bucket, bucket_path, region=REGION):
     Raises:
         Exception: on SSLError
         Exception: on ClientError
+
+    Note:
+        Files larger than 8 MB are uploaded in parts, concurrently, and the object
+            is given a Content-Type guessed from the filename, when known.
     """
     s3_client = boto3.client("s3", region_name=region)
     obj_name = os.path.basename(full_filename)
     if bucket_path:
         obj_name = f"{bucket_path}/{obj_name}"
+    extra_args = None
+    content_type, _encoding = mimetypes.guess_type(full_filename)
+    if content_type is not None:
+        extra_args = {"ContentType": content_type}
     try:
-        s3_client.upload_file(full_filename, bucket, obj_name)
+        s3_client.upload_file(
+            full_filename, bucket, obj_name, ExtraArgs=extra_args,
+            Config=UPLOAD_CONFIG)
     except SSLError:
         raise Exception(f"Failed with SSLError to upload {obj_name} to {bucket}")
     except ClientError as e:
@@ -847,7 +864,7 @@ def _query_table(bucket, s3_path, query_str, region=REGION, format="CSV"):
             rec_strings = recs_str.strip().split("\n")
             for rs in rec_strings:
                 if format == "JSON":
-                    rec = json.loads(rs)
+                    rec = orjson.loads(rs)
                 else:
                     rec = rs.split(",")
                 recs.append(rec)
@@ -1,12 +1,11 @@
 """Module containing file functions."""
 
-import glob
 import os
 
 SHP_EXT = "shp"
 SHP_EXTENSIONS = [
     ".shp", ".shx", ".dbf", ".prj", ".sbn", ".sbx", ".fbn", ".fbx", ".ain",
-    ".aih", ".ixs", ".mxs", ".atx", ".shp.xml", ".cpg", ".qix"],
+    ".aih", ".ixs", ".mxs", ".atx", ".shp.xml", ".cpg", ".qix"]
 
 
 # ...............................................
@@ -72,16 +71,18 @@ def delete_file(full_filename, delete_dir=False):
         pth, _ = os.path.split(full_filename)
         if full_filename is not None and os.path.exists(full_filename):
             base, ext = os.path.splitext(full_filename)
-            if ext == SHP_EXT:
-                similar_file_names = glob.glob(f"{base}.*")
+            if ext == f".{SHP_EXT}":
+                # Find related files by name in one pass over the directory entries
+                stem = os.path.basename(base)
                 try:
-                    for sim_file_name in similar_file_names:
-                        _, sim_ext = os.path.splitext(sim_file_name)
-                        if sim_ext in SHP_EXTENSIONS:
-                            os.remove(sim_file_name)
+                    with os.scandir(pth or os.curdir) as entries:
+                        for entry in entries:
+                            if (entry.name.startswith(stem)
+                                    and entry.name[len(stem):] in SHP_EXTENSIONS):
+                                os.remove(entry.path)
                 except Exception as e:
                     success = False
-                    msg = f"Failed to remove {sim_file_name}, {e}"
+                    msg = f"Failed to remove shapefile {full_filename}, {e}"
             else:
                 try:
                     os.remove(full_filename)
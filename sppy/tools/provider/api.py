@@ -1,8 +1,11 @@
 """Module containing functions for API Queries."""
+from concurrent.futures import as_completed, ThreadPoolExecutor
 from http import HTTPStatus
 from logging import WARN
 import requests
+from requests.adapters import HTTPAdapter
 import urllib
+from urllib3.util.retry import Retry
 
 from flask_app.common.s2n_type import BrokerOutput, S2nKey, ServiceProvider
 from flask_app.common.constants import ENCODING, URL_ESCAPES
@@ -11,6 +14,15 @@ from sppy.tools.util.logtools import logit
 from sppy.tools.s2n.lm_xml import fromstring, deserialize
 from sppy.tools.util.utils import add_errinfo, get_traceback
 
+# Shared by all queries, so connections to each provider (including Solr services)
+# are kept alive and reused, instead of a new TCP/TLS handshake for every request.
+_SESSION = requests.Session()
+for _prefix in ("http://", "https://"):
+    _SESSION.mount(
+        _prefix, HTTPAdapter(
+            pool_connections=16, pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2)))
+
 
 # .............................................................................
 class APIQuery:
@@ -345,7 +357,7 @@ class APIQuery:
         self.reason = None
         errmsg = None
         try:
-            response = requests.get(self.url, headers=self.headers, verify=verify)
+            response = _SESSION.get(self.url, headers=self.headers, verify=verify)
         except Exception as e:
             errmsg = self._get_error_message(err=e)
         else:
@@ -404,12 +416,13 @@ class APIQuery:
         self.output = None
         self.error = None
         errmsg = None
+        response = None
         # Post a file
         if file is not None:
             # TODO: send as bytes here?
-            files = {"files": open(file, "rb")}
             try:
-                response = requests.post(self.base_url, files=files)
+                with open(file, "rb") as inf:
+                    response = _SESSION.post(self.base_url, files={"files": inf})
             except Exception as e:
                 self.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
                 self.reason = f"Error posting to {self.base_url} {e}"
@@ -425,7 +438,7 @@ class APIQuery:
             query_as_string = urllib.parse.urlencode(all_params)
             url = f"{self.base_url}/?{query_as_string}"
             try:
-                response = requests.post(url, headers=self.headers)
+                response = _SESSION.post(url, headers=self.headers)
             except Exception as e:
                 self.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
                 self.reason = f"Error posting to {self.base_url} {e}"
@@ -434,7 +447,7 @@ class APIQuery:
                 self.reason = response.reason
 
         # Parse response
-        if response.ok:
+        if response is not None and response.ok:
             try:
                 if output_type == "json":
                     try:
@@ -459,3 +472,40 @@ class APIQuery:
 
         if errmsg is not None:
             self.error = errmsg
+
+    # ...............................................
+    @classmethod
+    def post_files(
+            cls, base_url, filenames, output_type="json", max_workers=8, logger=None):
+        """Post multiple files to the API concurrently.
+
+        Args:
+            base_url: URL to post each file to, such as a Solr update handler.
+            filenames: list of full filenames to post.
+            output_type: data type of body of post response
+            max_workers: maximum number of simultaneous posts.  If 1, post
+                sequentially.
+            logger: optional logger for saving output messages to file.
+
+        Returns:
+            dictionary of filenames and the APIQuery object which posted each, with
+                output, status_code, reason and error attributes set from the
+                response.
+
+        Note:
+            Posting is bound by network latency, so threads keep several requests in
+                flight at once, each on a connection from the shared session pool.
+        """
+        queries = {fname: cls(base_url, logger=logger) for fname in filenames}
+        if max_workers == 1:
+            for fname, api in queries.items():
+                api.query_by_post(output_type=output_type, file=fname)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        api.query_by_post, output_type=output_type, file=fname)
+                    for fname, api in queries.items()]
+                for future in as_completed(futures):
+                    future.result()
+        return queries
@@ -1,5 +1,6 @@
 """Module containing functions for GBIF API Queries."""
 from collections import OrderedDict
+import functools
 from logging import ERROR
 import os
 import requests
@@ -15,6 +16,17 @@ from sppy.tools.provider.api import APIQuery
 from sppy.tools.util.utils import add_errinfo
 
 
+# .............................................................................
+@functools.lru_cache(maxsize=4096)
+def _get_gbif_record(service, key):
+    # Only successful responses are cached, a failed query raises an exception
+    api = GbifAPI(service=service, key=key)
+    api.query()
+    if api.error is not None:
+        raise Exception(api.error)
+    return api.output
+
+
 # .............................................................................
 class GbifAPI(APIQuery):
     """Class to query GBIF APIs and return results."""
@@ -635,6 +647,32 @@ class GbifAPI(APIQuery):
 
         return recs
 
+    # ...............................................
+    @classmethod
+    def _get_record(cls, service, key, logger=None):
+        """Return the output of a query for one record of a GBIF service.
+
+        Args:
+            service: GBIF service to query
+            key: unique identifier for an object of this service
+            logger: object for logging messages and errors.
+
+        Returns:
+            output: dictionary of the JSON record, empty on query failure.
+
+        Note:
+            Records that rarely change, such as datasets and organizations, recur in
+                many requests, so successful responses are kept in a per-process LRU
+                cache, skipping a round trip to GBIF for each repeat.  Callers must
+                not modify the returned dictionary.
+        """
+        try:
+            output = _get_gbif_record(service, key)
+        except Exception as e:
+            logit(logger, str(e), refname=cls.__name__, log_level=ERROR)
+            output = {}
+        return output
+
     # ...............................................
     @classmethod
     def get_publishing_org(cls, pub_org_key, logger=None):
@@ -650,11 +688,10 @@ class GbifAPI(APIQuery):
         Raises:
             Exception: on query failure.
         """
-        org_api = GbifAPI(
-            service=GBIF.ORGANIZATION_SERVICE, key=pub_org_key, logger=logger)
         try:
-            org_api.query()
-            pub_org_name = org_api._get_output_val(org_api.output, "title")
+            output = cls._get_record(
+                GBIF.ORGANIZATION_SERVICE, pub_org_key, logger=logger)
+            pub_org_name = cls._get_output_val(output, "title")
         except Exception as e:
             logit(logger, str(e), refname=cls.__name__)
             raise
@@ -676,17 +713,14 @@ class GbifAPI(APIQuery):
         Raises:
             Exception: on query failure.
         """
-        ds_api = GbifAPI(
-            service=GBIF.DATASET_SERVICE, key=dataset_key, logger=logger)
         try:
-            ds_api.query()
-            dataset_name = ds_api._get_output_val(ds_api.output, "title")
+            output = cls._get_record(GBIF.DATASET_SERVICE, dataset_key, logger=logger)
+            dataset_name = cls._get_output_val(output, "title")
         except Exception as e:
             logit(logger, str(e), refname=cls.__name__)
             raise
         try:
-            citation = ds_api._get_nested_output_val(
-                ds_api.output, ["citation", "text"])
+            citation = cls._get_nested_output_val(output, ["citation", "text"])
         except Exception:
             citation = None
         return dataset_name, citation
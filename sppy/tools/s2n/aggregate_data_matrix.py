@@ -1,11 +1,14 @@
 """Matrix to summarize 2 dimensions of data by counts of a third in a sparse matrix."""
-import json
+import copy
 from logging import ERROR, INFO
-from numpy import integer as np_int, floating as np_float, ndarray
+import mmap
+from numpy import (
+    bool_ as np_bool, integer as np_int, floating as np_float, ndarray)
+import orjson
 import os
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
-from sppy.tools.s2n.constants import (SNKeys, Summaries)
+from sppy.tools.s2n.constants import COMPRESSED_EXTENSIONS, SNKeys, Summaries
 from sppy.tools.util.logtools import logit
 
 
@@ -36,7 +39,13 @@ class _AggregateDataMatrix:
         self._table_type = table_type
         self._data_datestr = data_datestr
         self._table = Summaries.get_table(table_type, datestr=data_datestr)
+        # Metadata written with the matrix, resolved and serialized once rather than
+        # per call
+        self._table_meta = Summaries.get_table(table_type)
+        self._table_meta_json = self._serialize_metadata(self._table_meta)
         self._keys = SNKeys.get_keys_for_table(table_type)
+        # Keys by SNKeys name, to avoid hashing Enum members when building stats
+        self._k = {snkey.name: keystr for snkey, keystr in self._keys.items()}
         self._logger = logger
         self._report = {}
 
@@ -50,6 +59,18 @@ class _AggregateDataMatrix:
     def data_datestr(self):
         return self._data_datestr
 
+    # ...........................
+    @property
+    def table_meta(self):
+        """Return the metadata for the table type of this matrix.
+
+        Returns:
+            dict: a copy of the metadata of the table type, from Summaries, without a
+                date, so changes by the caller do not alter this matrix.
+        """
+        table_meta = copy.deepcopy(self._table_meta)
+        return table_meta
+
     # ...............................................
     def _logme(self, msg, refname="", log_level=INFO):
         logit(self._logger, msg, refname=refname, log_level=log_level)
@@ -86,16 +107,43 @@ class _AggregateDataMatrix:
 
         Note:
             from https://stackoverflow.com/questions/27050108/convert-numpy-type-to-python
+
+        Note:
+            numpy integer, floating and bool scalars are converted with their own
+                item method, which returns the matching native python value.
         """
-        if isinstance(obj, np_int):
-            return int(obj)
-        elif isinstance(obj, np_float):
-            return float(obj)
-        elif isinstance(obj, ndarray):
+        if isinstance(obj, ndarray):
             return obj.tolist()
+        elif isinstance(obj, (np_int, np_float, np_bool)):
+            return obj.item()
         else:
             return obj
 
+    # ...............................................
+    @classmethod
+    def _serialize_metadata(cls, metadata):
+        """Serialize metadata to UTF-8 encoded JSON.
+
+        Args:
+            metadata (dict): metadata about matrix
+
+        Returns:
+            metastr (bytes): UTF-8 encoded JSON of the metadata.
+
+        Raises:
+            Exception: on failure to serialize metadata as JSON.
+
+        Note:
+            orjson encodes straight to bytes, and serializes numpy values and numeric
+                arrays natively.
+        """
+        try:
+            metastr = orjson.dumps(
+                metadata, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except Exception as e:
+            raise Exception(f"Failed to serialize metadata as JSON: {e}")
+        return metastr
+
     # ...............................................
     @classmethod
     def _dump_metadata(self, metadata, meta_fname):
@@ -109,16 +157,33 @@ class _AggregateDataMatrix:
             Exception: on failure to serialize metadata as JSON.
             Exception: on failure to write metadata json string to file.
         """
+        try:
+            metastr = self._serialize_metadata(metadata)
+        except Exception:
+            raise
+        try:
+            self._write_metadata(metastr, meta_fname)
+        except Exception:
+            raise
+
+    # ...............................................
+    @classmethod
+    def _write_metadata(cls, metastr, meta_fname):
+        """Write serialized metadata to a json file, deleting it first if exists.
+
+        Args:
+            metastr (bytes): UTF-8 encoded JSON metadata about matrix
+            meta_fname (str): local output filename for JSON metadata.
+
+        Raises:
+            Exception: on failure to write metadata json string to file.
+        """
         if os.path.exists(meta_fname):
             os.remove(meta_fname)
             print(f"Removed file {meta_fname}.")
 
         try:
-            metastr = json.dumps(metadata)
-        except Exception as e:
-            raise Exception(f"Failed to serialize metadata as JSON: {e}")
-        try:
-            with open(meta_fname, 'w') as outf:
+            with open(meta_fname, 'wb') as outf:
                 outf.write(metastr)
         except Exception as e:
             raise Exception(f"Failed to write metadata to {meta_fname}: {e}")
@@ -138,15 +203,12 @@ class _AggregateDataMatrix:
             Exception: on failure to read file.
             Exception: on failure load JSON metadata into a dictionary
         """
-        # Read JSON dictionary as string
-        try:
-            with open(meta_filename) as metaf:
-                meta_str = metaf.read()
-        except Exception as e:
-            raise Exception(f"Failed to load {meta_filename}: {e}")
-        # Load metadata from string
+        # Memory-map the file and parse the UTF-8 encoded JSON without copying it
         try:
-            meta_dict = json.loads(meta_str)
+            with open(meta_filename, "rb") as metaf:
+                with mmap.mmap(metaf.fileno(), 0, access=mmap.ACCESS_READ) as meta_mm:
+                    with memoryview(meta_mm) as meta_str:
+                        meta_dict = orjson.loads(meta_str)
         except Exception as e:
             raise Exception(f"Failed to load {meta_filename}: {e}")
 
@@ -176,9 +238,15 @@ class _AggregateDataMatrix:
             self._logme(f"Removed file {zip_fname}.")
 
         try:
-            with ZipFile(zip_fname, 'w') as zip:
+            with ZipFile(zip_fname, 'w', allowZip64=True) as zip:
                 for fname in input_fnames:
-                    zip.write(fname, os.path.basename(fname))
+                    # Store already-compressed matrix files, deflate the others
+                    if fname.endswith(COMPRESSED_EXTENSIONS):
+                        compress_type = ZIP_STORED
+                    else:
+                        compress_type = ZIP_DEFLATED
+                    zip.write(
+                        fname, os.path.basename(fname), compress_type=compress_type)
         except Exception as e:
             msg = f"Failed to write {zip_fname}: {e}"
             self._logme(msg, log_level=ERROR)
@@ -245,6 +313,14 @@ class _AggregateDataMatrix:
             # Unzip to local dir
             with ZipFile(zip_filename, mode="r") as archive:
                 archive.extractall(f"{local_path}/")
+                member_names = archive.namelist()
+            # Older archives may hold the matrix in another format, such as CSV for
+            #   summary tables, so use the extension of the matrix member found
+            if f"{fname}{mtx_ext}" not in member_names:
+                for mname in member_names:
+                    mbase, mext = os.path.splitext(mname)
+                    if mbase == fname and mext != ".json":
+                        mtx_fname = f"{local_path}/{mname}"
             for fn in [mtx_fname, meta_fname]:
                 if not os.path.exists(fn):
                     raise Exception(f"Missing expected file {fn}")
@@ -1,4 +1,5 @@
 """Tools to compute dataset x species statistics from S3 data."""
+from concurrent.futures import as_completed, ThreadPoolExecutor
 from logging import INFO
 import os
 
@@ -281,43 +282,59 @@ if __name__ == "__main__":
     # .................................
     # Save sparse matrix to S3
     # .................................
-    out_filename = agg_sparse_mtx.compress_to_file()
-    upload_to_s3(out_filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION)
-    # Copy logfile to S3
-    upload_to_s3(tst_logger.filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION)
-
-    # .................................
-    # Download data and recreate sparse matrix
-    # .................................
-    table = Summaries.get_table(mtx_table_type, data_datestr)
-    zip_fname = f"{table['fname']}.zip"
-    # Only download if file does not exist
-    zip_filename = download_from_s3(
-        PROJ_BUCKET, SUMMARY_FOLDER, zip_fname, local_path=local_path,
-        overwrite=overwrite)
-
-    # Only extract if files do not exist
-    sparse_coo, row_categ, col_categ, table_type, _data_datestr = \
-        SparseMatrix.uncompress_zipped_data(
-            zip_filename, local_path=local_path, overwrite=overwrite)
-
-    # Create
-    sp_mtx = SparseMatrix(
-        sparse_coo, mtx_table_type, data_datestr, row_categ, col_categ,
-        logger=tst_logger)
-
-    # .................................
-    # Create 2 summary matrices from sparse matrix and upload
-    # .................................
-    sp_sum_mtx = SummaryMatrix.init_from_sparse_matrix(sp_mtx, axis=0, logger=tst_logger)
-    spsum_table_type = sp_sum_mtx.table_type
-    out_filename = sp_sum_mtx.compress_to_file()
-    upload_to_s3(out_filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION)
-
-    ds_sum_mtx = SummaryMatrix.init_from_sparse_matrix(sp_mtx, axis=1, logger=tst_logger)
-    dssum_table_type = ds_sum_mtx.table_type
-    out_filename = ds_sum_mtx.compress_to_file()
-    upload_to_s3(out_filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION)
+    # Uploads are network-bound, so run them in threads, overlapping with the next
+    #   local computation or compression
+    with ThreadPoolExecutor(max_workers=4) as upload_executor:
+        out_filename = agg_sparse_mtx.compress_to_file()
+        mtx_upload = upload_executor.submit(
+            upload_to_s3, out_filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION)
+        # Copy logfile to S3, after writing any queued log messages
+        tst_logger.flush()
+        log_upload = upload_executor.submit(
+            upload_to_s3, tst_logger.filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION)
+        # Wait for the matrix upload before downloading it again
+        mtx_upload.result()
+
+        # .................................
+        # Download data and recreate sparse matrix
+        # .................................
+        table = Summaries.get_table(mtx_table_type, data_datestr)
+        zip_fname = f"{table['fname']}.zip"
+        # Only download if file does not exist
+        zip_filename = download_from_s3(
+            PROJ_BUCKET, SUMMARY_FOLDER, zip_fname, local_path=local_path,
+            overwrite=overwrite)
+
+        # Only extract if files do not exist
+        sparse_coo, row_categ, col_categ, table_type, _data_datestr = \
+            SparseMatrix.uncompress_zipped_data(
+                zip_filename, local_path=local_path, overwrite=overwrite)
+
+        # Create
+        sp_mtx = SparseMatrix(
+            sparse_coo, mtx_table_type, data_datestr, row_categ, col_categ,
+            logger=tst_logger)
+
+        # .................................
+        # Create 2 summary matrices from sparse matrix and upload
+        # .................................
+        sp_sum_mtx = SummaryMatrix.init_from_sparse_matrix(
+            sp_mtx, axis=0, logger=tst_logger)
+        spsum_table_type = sp_sum_mtx.table_type
+        out_filename = sp_sum_mtx.compress_to_file()
+        sum_uploads = [upload_executor.submit(
+            upload_to_s3, out_filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION)]
+
+        # Build and compress the second summary while the first uploads
+        ds_sum_mtx = SummaryMatrix.init_from_sparse_matrix(
+            sp_mtx, axis=1, logger=tst_logger)
+        dssum_table_type = ds_sum_mtx.table_type
+        out_filename = ds_sum_mtx.compress_to_file()
+        sum_uploads.append(upload_executor.submit(
+            upload_to_s3, out_filename, PROJ_BUCKET, SUMMARY_FOLDER, REGION))
+        # Wait for all uploads (raising any upload failure) before downloading again
+        for upload in as_completed([log_upload, *sum_uploads]):
+            upload.result()
 
     # .................................
     # Download data and recreate 2 summary matrices
@@ -1,7 +1,9 @@
 """Constants for Specify Network Analyst Data."""
 import copy
+import functools
 import os.path
 from enum import Enum
+from types import MappingProxyType
 
 from sppy.aws.aws_constants import (
     DATASET_GBIF_KEY, DATESTR_TOKEN,
@@ -9,6 +11,8 @@ from sppy.aws.aws_constants import (
 
 # .............................................................................
 MATRIX_SEPARATOR = ","
+# Matrix file formats compressed internally, stored rather than deflated in zipfiles
+COMPRESSED_EXTENSIONS = (".npz", ".parquet")
 
 
 # .............................................................................
@@ -83,7 +87,7 @@ class Summaries:
                 "code": SUMMARY_TABLE_TYPES.SPECIES_DATASET_SUMMARY,
                 "fname": f"speciesxdataset_summary_{DATESTR_TOKEN}",
                 "table_format": "Zip",
-                "matrix_extension": ".csv",
+                "matrix_extension": ".parquet",
                 # Axis 0, matches row (axis 0) in SPECIES_DATASET_MATRIX
                 "row": "taxonkey_species",
                 # Axis 1
@@ -96,7 +100,7 @@ class Summaries:
                 "code": SUMMARY_TABLE_TYPES.DATASET_SPECIES_SUMMARY,
                 "fname": f"datasetxspecies_summary_{DATESTR_TOKEN}",
                 "table_format": "Zip",
-                "matrix_extension": ".csv",
+                "matrix_extension": ".parquet",
                 # Axis 0, matches column (axis 1) in SPECIES_DATASET_MATRIX
                 "row": DATASET_GBIF_KEY,
                 # Axis 1
@@ -293,6 +297,7 @@ class SNKeys(Enum):
      ) = range(200, 214)
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_keys_for_table(cls, table_type):
         """Return keystrings for statistics dictionary for specific aggregation tables.
 
@@ -300,11 +305,15 @@ class SNKeys(Enum):
             table_type (aws_constants.SUMMARY_TABLE_TYPES): type of aggregated data
 
         Returns:
-            keys (dict): Dictionary of strings to be used as keys for each type of
-                value in a dictionary of statistics.
+            keys (types.MappingProxyType): Read-only dictionary of strings to be used
+                as keys for each type of value in a dictionary of statistics.
 
         Raises:
             Exception: on un-implemented table type.
+
+        Note:
+            Keys are built once per table type and the same read-only view is returned
+                to every caller, so one caller cannot change them for the others.
         """
         if table_type == SUMMARY_TABLE_TYPES.SPECIES_DATASET_MATRIX:
             keys = {
@@ -426,4 +435,5 @@ class SNKeys(Enum):
         #     }
         else:
             raise Exception(f"Keys not defined for table {table_type}")
+        keys = MappingProxyType(keys)
         return keys
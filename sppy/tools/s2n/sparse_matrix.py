@@ -1,17 +1,191 @@
 """Matrix to summarize 2 dimensions of data by counts of a third in a sparse matrix."""
 from logging import ERROR
 import numpy as np
+import os
 import pandas as pd
 from pandas.api.types import CategoricalDtype
-import random
+import pyarrow as pa
 import scipy.sparse
+import struct
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
 from sppy.aws.aws_constants import PROJ_BUCKET, DATASET_GBIF_KEY
 from sppy.tools.s2n.aggregate_data_matrix import _AggregateDataMatrix
-from sppy.tools.s2n.constants import (SNKeys, Summaries)
+from sppy.tools.s2n.constants import SNKeys
 from sppy.tools.s2n.spnet import SpNetAnalyses
 
 
+# .............................................................................
+# SNKeys names of the stats of all columns (axis 0) or all rows (axis 1) that are
+# compared to one column or row, for counts ("axis") or totals ("value")
+_COMPARISON_KEYS = {
+    (0, "value"): (
+        "COLS_TOTAL", "COLS_MIN_TOTAL", "COLS_MAX_TOTAL", "COLS_MEAN_TOTAL",
+        "COLS_MEDIAN_TOTAL"),
+    (0, "axis"): (
+        "COLS_COUNT", "COLS_MIN_COUNT", "COLS_MAX_COUNT", "COLS_MEAN_COUNT",
+        "COLS_MEDIAN_COUNT"),
+    (1, "value"): (
+        "ROWS_TOTAL", "ROWS_MIN_TOTAL", "ROWS_MAX_TOTAL", "ROWS_MEAN_TOTAL",
+        "ROWS_MEDIAN_TOTAL"),
+    (1, "axis"): (
+        "ROWS_COUNT", "ROWS_MIN_COUNT", "ROWS_MAX_COUNT", "ROWS_MEAN_COUNT",
+        "ROWS_MEDIAN_COUNT"),
+}
+
+
+# .............................................................................
+def _matching_positions(data, indices, target):
+    """Return the positions of non-zero elements equal to a target value.
+
+    Args:
+        data (numpy.ndarray): non-zero values of a sparse vector.
+        indices (numpy.ndarray): positions of the values in data within the vector.
+        target: value to search for.
+
+    Returns:
+        numpy.ndarray: positions in indices where data equals target.
+    """
+    return indices[data == target]
+
+
+# .............................................................................
+def _row_nnz(csr, idx):
+    """Return the non-zero values and their positions for one row of a CSR matrix.
+
+    Args:
+        csr (scipy.sparse.csr_array): compressed sparse matrix.  For a CSC matrix,
+            this returns the values and positions for column idx.
+        idx (int): index of the row (or column for CSC) of interest.
+
+    Returns:
+        data (numpy.ndarray): non-zero values in the row.
+        indices (numpy.ndarray): column (or row for CSC) indexes of the values.
+
+    Note:
+        Slices the compressed arrays directly, without constructing a new sparse
+            matrix as getrow does.
+    """
+    start, stop = csr.indptr[idx], csr.indptr[idx + 1]
+    return csr.data[start:stop], csr.indices[start:stop]
+
+
+# .............................................................................
+def _load_npz_coo_mmap(npz_filename):
+    """Load a COO array from an npz file, memory-mapping uncompressed arrays.
+
+    Args:
+        npz_filename (str): Filename of scipy.sparse.coo_array data in npz format.
+
+    Returns:
+        sparse_coo (scipy.sparse.coo_array): Sparse Matrix containing data.  Values
+            and coordinates stored uncompressed are read from disk as they are used.
+
+    Note:
+        Arrays in a compressed npz file (or a non-COO matrix) cannot be
+            memory-mapped, so these are loaded into memory with scipy.sparse.load_npz.
+    """
+    with np.load(npz_filename) as npz:
+        mtx_format = npz["format"].item()
+        shape = tuple(npz["shape"])
+    if mtx_format != b"coo":
+        return scipy.sparse.load_npz(npz_filename)
+
+    arrays = {}
+    with ZipFile(npz_filename, mode="r") as zip, open(npz_filename, "rb") as f:
+        for key in ("data", "row", "col"):
+            zinfo = zip.getinfo(f"{key}.npy")
+            if zinfo.compress_type != ZIP_STORED:
+                return scipy.sparse.load_npz(npz_filename)
+            # Skip the zip local file header (30 bytes + name + extra field) to the
+            # start of the .npy content, then past the .npy header to the array
+            f.seek(zinfo.header_offset)
+            name_len, extra_len = struct.unpack("<HH", f.read(30)[26:30])
+            f.seek(zinfo.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                arr_shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                arr_shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if 0 in arr_shape:
+                arrays[key] = np.empty(arr_shape, dtype=dtype)
+            else:
+                arrays[key] = np.memmap(
+                    npz_filename, dtype=dtype, mode="r", offset=f.tell(),
+                    shape=arr_shape, order="F" if fortran else "C")
+    sparse_coo = scipy.sparse.coo_array(
+        (arrays["data"], (arrays["row"], arrays["col"])), shape=shape)
+    return sparse_coo
+
+
+# .............................................................................
+def _encode_labels(labels):
+    """Encode labels as one UTF-8 byte array and the offsets of each label in it.
+
+    Args:
+        labels (sequence of str): ordered labels for one axis of a matrix.
+
+    Returns:
+        label_bytes (numpy.ndarray): uint8 array of all labels, UTF-8 encoded.
+        offsets (numpy.ndarray): int64 array of start positions of each label in
+            label_bytes, followed by the total length.
+
+    Note:
+        Unlike a fixed-width unicode array, this pads no label to the longest one,
+            and unlike an object array, it is saved and loaded without pickling.
+
+    Note:
+        These are the offsets and data buffers of an Arrow large_string array, which
+            pyarrow fills in C, without encoding each label in Python.
+    """
+    arr = pa.array(labels, type=pa.large_string())
+    _validity, offsets_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=np.int64)[:len(arr) + 1]
+    if data_buf is None:
+        label_bytes = np.zeros(0, dtype=np.uint8)
+    else:
+        label_bytes = np.frombuffer(data_buf, dtype=np.uint8)[:offsets[-1]]
+    return label_bytes, offsets
+
+
+# .............................................................................
+def _decode_labels(label_bytes, offsets):
+    """Decode labels from a UTF-8 byte array and the offsets of each label in it.
+
+    Args:
+        label_bytes (numpy.ndarray): uint8 array of all labels, UTF-8 encoded.
+        offsets (numpy.ndarray): start positions of each label in label_bytes,
+            followed by the total length.
+
+    Returns:
+        labels (numpy.ndarray): ordered labels for one axis of a matrix.
+    """
+    arr = pa.LargeStringArray.from_buffers(
+        offsets.size - 1, pa.py_buffer(offsets.astype(np.int64)),
+        pa.py_buffer(label_bytes))
+    labels = arr.to_numpy(zero_copy_only=False)
+    return labels
+
+
+# .............................................................................
+def _load_npz_labels(npz_filename):
+    """Load row and column labels saved with a COO array in an npz file.
+
+    Args:
+        npz_filename (str): Filename of scipy.sparse.coo_array data in npz format.
+
+    Returns:
+        row_labels (numpy.ndarray): ordered row labels, or None if not in the file.
+        col_labels (numpy.ndarray): ordered column labels, or None if not in the file.
+    """
+    row_labels = col_labels = None
+    with np.load(npz_filename) as npz:
+        if "row_labels" in npz.files and "col_labels" in npz.files:
+            row_labels = _decode_labels(npz["row_labels"], npz["row_label_offsets"])
+            col_labels = _decode_labels(npz["col_labels"], npz["col_label_offsets"])
+    return row_labels, col_labels
+
+
 # .............................................................................
 class SparseMatrix(_AggregateDataMatrix):
     """Class for managing computations for counts of aggregator0 x aggregator1."""
@@ -44,6 +218,14 @@ class SparseMatrix(_AggregateDataMatrix):
         self._coo_array = sparse_coo_array
         self._row_categ = row_category
         self._col_categ = column_category
+        # Cache category labels as ndarrays to avoid pandas Index lookups per label
+        self._row_labels = np.asarray(row_category.categories)
+        self._col_labels = np.asarray(column_category.categories)
+        # Compressed copies of the matrix, created on first use
+        self._csr = None
+        self._csc = None
+        # Stats of all rows or all columns for comparisons, created on first use
+        self._all_stats = {}
         _AggregateDataMatrix.__init__(self, table_type, data_datestr, logger=logger)
 
     # ...........................
@@ -78,18 +260,15 @@ class SparseMatrix(_AggregateDataMatrix):
                 datasetkey (for the column labels/x), species (for the row labels/y),
                 and occurrence count.
         """
-        # Get unique values to use as categories for scipy column and row indexes,
-        # remove None
-        unique_x_vals = list(stacked_df[x_fld].dropna().unique())
-        unique_y_vals = list(stacked_df[y_fld].dropna().unique())
+        # Get unique values (without None) to use as categories for scipy column and
+        #   row indexes, and the codes matching original stacked data, which replace
+        #   column names from stacked data dataframe with integer codes for row and
+        #   column indexes in the new scipy matrix, hashing each label only once
+        col_idx, unique_x_vals = pd.factorize(stacked_df[x_fld])
+        row_idx, unique_y_vals = pd.factorize(stacked_df[y_fld])
         # Categories allow using codes as the integer index for scipy matrix
         y_categ = CategoricalDtype(unique_y_vals, ordered=True)
         x_categ = CategoricalDtype(unique_x_vals, ordered=True)
-        # Create a list of category codes matching original stacked data to replace
-        #   column names from stacked data dataframe with integer codes for row and
-        #   column indexes in the new scipy matrix
-        col_idx = stacked_df[x_fld].astype(x_categ).cat.codes
-        row_idx = stacked_df[y_fld].astype(y_categ).cat.codes
         # This creates a new matrix in Coordinate list (COO) format.  COO stores a list
         # of (row, column, value) tuples.  Convert to CSR or CSC for efficient Row or
         # Column slicing, respectively
@@ -124,76 +303,78 @@ class SparseMatrix(_AggregateDataMatrix):
 
     # .............................................................................
     def _to_dataframe(self):
+        # Pass CSC so pandas does not convert COO for every column
         sdf = pd.DataFrame.sparse.from_spmatrix(
-            self._coo_array,
+            self._to_csc(),
             index=self._row_categ.categories,
             columns=self._col_categ.categories)
         return sdf
 
+    # .............................................................................
+    def _to_dense_arrays(self):
+        """Return dense matrix values and labels without constructing a DataFrame.
+
+        Returns:
+            values (numpy.ndarray): 2d array of all matrix values, including zeros.
+            row_labels (numpy.ndarray): labels for axis 0/rows.
+            col_labels (numpy.ndarray): labels for axis 1/columns.
+        """
+        return self._to_csr().toarray(), self._row_labels, self._col_labels
+
     # ...............................................
-    def _get_code_from_category(self, label, axis=0):
+    def _get_labels(self, axis=0):
         if axis == 0:
-            categ = self._row_categ
+            labels = self._row_labels
         elif axis == 1:
-            categ = self._col_categ
+            labels = self._col_labels
         else:
             raise Exception(f"2D sparse array does not have axis {axis}")
-
-        # returns a tuple of a single 1-dimensional array of locations
-        arr = np.where(categ.categories == label)[0]
-        try:
-            # labels are unique in categories so there will be 0 or 1 value in the array
-            code = arr[0]
-        except IndexError:
-            raise
-        return code
+        return labels
 
     # ...............................................
-    def _get_category_from_code(self, code, axis=0):
+    def _get_code_from_category(self, label, axis=0):
         if axis == 0:
-            categ = self._row_categ
+            categories = self._row_categ.categories
         elif axis == 1:
-            categ = self._col_categ
+            categories = self._col_categ.categories
         else:
             raise Exception(f"2D sparse array does not have axis {axis}")
-        category = categ.categories[code]
+        # Labels are unique in categories, so look up the code in the hashtable the
+        # CategoricalDtype already holds, rather than scanning all labels
+        try:
+            code = categories.get_loc(label)
+        except KeyError:
+            raise IndexError(f"Label {label} does not exist on axis {axis}")
+        return code
+
+    # ...............................................
+    def _get_category_from_code(self, code, axis=0):
+        category = self._get_labels(axis=axis)[code]
         return category
 
     # ...............................................
     def _export_categories(self, axis=0):
-        if axis == 0:
-            categ = self._row_categ
-        elif axis == 1:
-            categ = self._col_categ
-        else:
-            raise Exception(f"2D sparse array does not have axis {axis}")
-        cat_lst = categ.categories.tolist()
+        cat_lst = self._get_labels(axis=axis).tolist()
         return cat_lst
 
     # ...............................................
     def _get_categories_from_code(self, code_list, axis=0):
-        if axis == 0:
-            categ = self._row_categ
-        elif axis == 1:
-            categ = self._col_categ
-        else:
-            raise Exception(f"2D sparse array does not have axis {axis}")
-        category_labels = []
-        for code in code_list:
-            category_labels.append(categ.categories[code])
+        category_labels = self._get_labels(axis=axis)[code_list].tolist()
         return category_labels
 
     # ...........................
     def _to_csr(self):
-        # Convert to CSR format for efficient row slicing
-        csr = self._coo_array.tocsr()
-        return csr
+        # Convert to CSR format for efficient row slicing, once
+        if self._csr is None:
+            self._csr = self._coo_array.tocsr()
+        return self._csr
 
     # ...........................
     def _to_csc(self):
-        # Convert to CSC format for efficient column slicing
-        csc = self._coo_array.tocsr()
-        return csc
+        # Convert to CSC format for efficient column slicing, once
+        if self._csc is None:
+            self._csc = self._coo_array.tocsc()
+        return self._csc
 
     # ...............................................
     def get_random_labels(self, count, axis=0):
@@ -209,15 +390,10 @@ class SparseMatrix(_AggregateDataMatrix):
         Raises:
             Exception: on axis not in (0, 1)
         """
-        if axis == 0:
-            categ = self._row_categ
-        elif axis == 1:
-            categ = self._col_categ
-        else:
-            raise Exception(f"2D sparse array does not have axis {axis}")
-        # Get a random sample of category indexes
-        idxs = random.sample(range(1, len(categ.categories)), count)
-        labels = [self._get_category_from_code(i, axis=axis) for i in idxs]
+        all_labels = self._get_labels(axis=axis)
+        # Get a random sample of category indexes (0-based)
+        idxs = np.random.default_rng().choice(all_labels.size, count, replace=False)
+        labels = all_labels.take(idxs).tolist()
         return labels
 
     # ...............................................
@@ -269,14 +445,44 @@ class SparseMatrix(_AggregateDataMatrix):
         except IndexError:
             raise
         if axis == 0:
-            vector = self._coo_array.getrow(idx)
+            vector = self._to_csr()[idx:idx + 1]
         elif axis == 1:
-            vector = self._coo_array.getcol(idx)
+            vector = self._to_csc()[:, idx:idx + 1]
         else:
             raise Exception(f"2D sparse array does not have axis {axis}")
         idx = self.convert_np_vals_for_json(idx)
         return vector, idx
 
+    # ...............................................
+    def _get_nnz_from_label(self, label, axis=0):
+        # Return non-zero values and their positions in the row/column with label,
+        # without constructing a new sparse array
+        try:
+            idx = self._get_code_from_category(label, axis=axis)
+        except IndexError:
+            raise
+        if axis == 0:
+            data, indices = _row_nnz(self._to_csr(), idx)
+        else:
+            data, indices = _row_nnz(self._to_csc(), idx)
+        return data, indices
+
+    # ...............................................
+    def _get_extreme_val_labels_from_nnz(self, data, indices, axis=0, is_max=True):
+        # Return the min/max value in a row/column and the labels containing it
+        if is_max is True:
+            target = data.max()
+        else:
+            target = data.min()
+        # Label axis is the opposite of the vector axis
+        if axis == 0:
+            label_axis = 1
+        else:
+            label_axis = 0
+        idxs = _matching_positions(data, indices, target)
+        labels = self._get_labels(axis=label_axis)[idxs].tolist()
+        return self.convert_np_vals_for_json(target), labels
+
     # ...............................................
     def sum_vector(self, label, axis=0):
         """Get the total of values in a single row or column.
@@ -292,10 +498,10 @@ class SparseMatrix(_AggregateDataMatrix):
             IndexError: on label not present in vector header
         """
         try:
-            vector, _idx = self.get_vector_from_label(label, axis=axis)
+            data, _indices = self._get_nnz_from_label(label, axis=axis)
         except IndexError:
             raise
-        total = vector.sum()
+        total = data.sum()
         return total
 
     # ...............................................
@@ -314,13 +520,12 @@ class SparseMatrix(_AggregateDataMatrix):
         # Returns row_idxs, col_idxs, vals of NNZ values in row
         row_idxs, col_idxs, vals = scipy.sparse.find(col)
         if value is None:
-            idxs_lst = [row_idxs[i] for i in range(len(row_idxs))]
+            idxs = row_idxs
         else:
             tmp_idxs = np.where(vals == value)[0]
-            tmp_idx_lst = [tmp_idxs[i] for i in range(len(tmp_idxs))]
             # Row indexes of maxval in column
-            idxs_lst = [row_idxs[i] for i in tmp_idx_lst]
-        row_labels = [self._get_category_from_code(idx, axis=0) for idx in idxs_lst]
+            idxs = row_idxs[tmp_idxs]
+        row_labels = self._row_labels[idxs].tolist()
         return row_labels
 
     # ...............................................
@@ -370,25 +575,27 @@ class SparseMatrix(_AggregateDataMatrix):
         # Returns row_idxs, col_idxs, vals of NNZ values in row
         row_idxs, col_idxs, vals = scipy.sparse.find(vector)
 
-        # Get indexes of target value within NNZ vals
-        tmp_idxs = np.where(vals == target_val)[0]
-        tmp_idx_lst = [tmp_idxs[i] for i in range(len(tmp_idxs))]
         # Get actual indexes (within all zero/non-zero elements) of target in vector
         if axis == 0:
             # Column indexes of maxval in row
-            idxs_lst = [col_idxs[i] for i in tmp_idx_lst]
+            idxs = _matching_positions(vals, col_idxs, target_val)
             # Label axis is the opposite of the vector axis
             label_axis = 1
         elif axis == 1:
             # Row indexes of maxval in column
-            idxs_lst = [row_idxs[j] for j in tmp_idx_lst]
+            idxs = _matching_positions(vals, row_idxs, target_val)
             label_axis = 0
         else:
             raise Exception(f"2D sparse array does not have axis {axis}")
 
         # Convert from indexes to labels
-        labels = [
-            self._get_category_from_code(idx, axis=label_axis) for idx in idxs_lst]
+        labels = self._get_labels(axis=label_axis)[idxs].tolist()
+        return labels
+
+    # ...............................................
+    def _get_labels_for_val_in_array(self, arr, target_val, axis=0):
+        # Get axis labels for positions in a dense 1d array containing target_val
+        labels = self._get_labels(axis=axis)[arr == target_val].tolist()
         return labels
 
     # ...............................................
@@ -410,9 +617,7 @@ class SparseMatrix(_AggregateDataMatrix):
         # Returns row_idxs, col_idxs, vals of NNZ values in row
         row_idxs, col_idxs, vals = scipy.sparse.find(vector)
         # Get indexes of target value within NNZ vals
-        tmp_idxs = np.where(vals == target_val)[0]
-        tmp_idx_lst = [tmp_idxs[i] for i in range(len(tmp_idxs))]
-        count = len(tmp_idx_lst)
+        count = int(np.count_nonzero(vals == target_val))
         return count
 
     # ...............................................
@@ -454,17 +659,17 @@ class SparseMatrix(_AggregateDataMatrix):
             Inline comments are specific to a SUMMARY_TABLE_TYPES.SPECIES_DATASET_MATRIX
                 with row/column/value = species/dataset/occ_count
         """
-        # Get row (sparse array), and its index
+        # Get non-zero values of the row and their column indexes
         try:
-            row, row_idx = self.get_vector_from_label(row_label, axis=0)
+            row_data, col_idxs = self._get_nnz_from_label(row_label, axis=0)
         except IndexError:
             raise
         # Largest/smallest Occurrence count for this Species, and column (dataset)
         # labels that contain it
-        maxval, max_col_labels = self.get_extreme_val_labels_for_vector(
-            row, axis=0, is_max=True)
-        minval, min_col_labels = self.get_extreme_val_labels_for_vector(
-            row, axis=0, is_max=False)
+        maxval, max_col_labels = self._get_extreme_val_labels_from_nnz(
+            row_data, col_idxs, axis=0, is_max=True)
+        minval, min_col_labels = self._get_extreme_val_labels_from_nnz(
+            row_data, col_idxs, axis=0, is_max=False)
         # Get dataset labels, if column is dataset, for datasets with max occurrences
         # of species.  Datasets with only 1 occurrence is often large number
         names = self._lookup_dataset_names(max_col_labels)
@@ -472,9 +677,9 @@ class SparseMatrix(_AggregateDataMatrix):
         stats = {
             self._keys[SNKeys.ROW_LABEL]: row_label,
             # Total Occurrences for this Species
-            self._keys[SNKeys.ROW_TOTAL]: self.convert_np_vals_for_json(row.sum()),
+            self._keys[SNKeys.ROW_TOTAL]: self.convert_np_vals_for_json(row_data.sum()),
             # Count of Datasets containing this Species
-            self._keys[SNKeys.ROW_COUNT]: self.convert_np_vals_for_json(row.nnz),
+            self._keys[SNKeys.ROW_COUNT]: self.convert_np_vals_for_json(row_data.size),
             # Return min/max count in this species and datasets for that count
             self._keys[SNKeys.ROW_MIN_TOTAL]: minval,
             self._keys[SNKeys.ROW_MAX_TOTAL]: maxval,
@@ -489,63 +694,69 @@ class SparseMatrix(_AggregateDataMatrix):
 
         Returns:
             all_row_stats (dict): counts and statistics about all rows.
-            (numpy.ndarray): array of totals of all rows.
         """
-        # Sum all rows to return a column (axis=1) of species totals
-        all_totals = self._coo_array.sum(axis=1)
-        # Min total and rows that contain it
-        min_total = all_totals.min()
-        min_total_number = self.count_val_in_vector(all_totals, min_total)
-        # Max total and rows that contain that
-        max_total = all_totals.max()
-        # Get species names for largest number of occurrences
-        max_total_labels = self.get_labels_for_val_in_vector(
-            all_totals, max_total, axis=1)
+        # Sum and count all rows in one scan of the matrix
+        all_totals, all_counts = self.get_totals_and_counts(axis=1)
+        all_row_stats = self._get_all_row_axis_stats(all_counts)
+        all_row_stats.update(self._get_all_row_value_stats(all_totals))
+        return all_row_stats
 
-        # Get number of non-zero entries for every row (column, numpy.ndarray)
-        all_counts = self._coo_array.getnnz(axis=1)
+    # ...............................................
+    def _get_all_row_axis_stats(self, all_counts):
+        # Return stats of the counts of non-zero columns for all rows, given the
+        # number of non-zero entries for every row (1d numpy.ndarray)
+        k = self._k
         min_count = all_counts.min()
         min_count_number = self.count_val_in_vector(all_counts, min_count)
         max_count = all_counts.max()
-        max_count_labels = self.get_labels_for_val_in_vector(
-            all_counts, max_count, axis=1)
+        max_count_labels = self._get_labels_for_val_in_array(
+            all_counts, max_count, axis=0)
 
         # Count columns with at least one non-zero entry (all columns)
         row_count = self._coo_array.shape[0]
-        all_row_stats = {
+        axis_stats = {
             # Count of other axis
-            self._keys[SNKeys.ROWS_COUNT]: row_count,
-            self._keys[SNKeys.ROWS_MIN_COUNT]:
-                self.convert_np_vals_for_json(min_count),
-            self._keys[SNKeys.ROWS_MIN_TOTAL_NUMBER]: min_count_number,
+            k["ROWS_COUNT"]: row_count,
+            k["ROWS_MIN_COUNT"]: self.convert_np_vals_for_json(min_count),
+            k["ROWS_MIN_COUNT_NUMBER"]: min_count_number,
+
+            k["ROWS_MEAN_COUNT"]: self.convert_np_vals_for_json(all_counts.mean()),
+            k["ROWS_MEDIAN_COUNT"]:
+                self.convert_np_vals_for_json(np.median(all_counts)),
 
-            self._keys[SNKeys.ROWS_MEAN_COUNT]:
-                self.convert_np_vals_for_json(all_counts.mean()),
-            self._keys[SNKeys.ROWS_MEDIAN_COUNT]:
-                self.convert_np_vals_for_json(np.median(all_counts, axis=0)),
+            k["ROWS_MAX_COUNT"]: self.convert_np_vals_for_json(max_count),
+            k["ROWS_MAX_COUNT_LABELS"]: max_count_labels,
+        }
+        return axis_stats
 
-            self._keys[SNKeys.ROWS_MAX_COUNT]:
-                self.convert_np_vals_for_json(max_count),
-            self._keys[SNKeys.ROWS_MAX_COUNT_LABELS]: max_count_labels,
+    # ...............................................
+    def _get_all_row_value_stats(self, all_totals):
+        # Return stats of the totals of values for all rows, given the 1d array
+        # (one per row) of species totals
+        k = self._k
+        # Min total and rows that contain it
+        min_total = all_totals.min()
+        min_total_number = self.count_val_in_vector(all_totals, min_total)
+        # Max total and rows that contain that
+        max_total = all_totals.max()
+        # Get species names for largest number of occurrences
+        max_total_labels = self._get_labels_for_val_in_array(
+            all_totals, max_total, axis=0)
 
+        value_stats = {
             # Total of values
-            self._keys[SNKeys.ROWS_TOTAL]:
-                self.convert_np_vals_for_json(all_totals.sum()),
-            self._keys[SNKeys.ROWS_MIN_TOTAL]:
-                self.convert_np_vals_for_json(min_total),
-            self._keys[SNKeys.ROWS_MIN_TOTAL]: min_total_number,
-
-            self._keys[SNKeys.ROWS_MEAN_TOTAL]:
-                self.convert_np_vals_for_json(all_totals.mean()),
-            self._keys[SNKeys.ROWS_MEDIAN_TOTAL]: self.convert_np_vals_for_json(
-                np.median(all_totals, axis=0)[0, 0]),
-
-            self._keys[SNKeys.ROWS_MAX_TOTAL]:
-                self.convert_np_vals_for_json(max_total),
-            self._keys[SNKeys.ROW_MAX_TOTAL_LABELS]: max_total_labels,
-        }
+            k["ROWS_TOTAL"]: self.convert_np_vals_for_json(all_totals.sum()),
+            k["ROWS_MIN_TOTAL"]: self.convert_np_vals_for_json(min_total),
+            k["ROWS_MIN_TOTAL_NUMBER"]: min_total_number,
 
-        return all_row_stats
+            k["ROWS_MEAN_TOTAL"]: self.convert_np_vals_for_json(all_totals.mean()),
+            k["ROWS_MEDIAN_TOTAL"]:
+                self.convert_np_vals_for_json(np.median(all_totals)),
+
+            k["ROWS_MAX_TOTAL"]: self.convert_np_vals_for_json(max_total),
+            k["ROWS_MAX_TOTAL_LABELS"]: max_total_labels,
+        }
+        return value_stats
 
     # ...............................................
     def get_column_stats(self, col_label=None):
@@ -587,29 +798,31 @@ class SparseMatrix(_AggregateDataMatrix):
                 with row/column/value = species/dataset/occ_count
         """
         stats = {}
-        # Get column (sparse array), and its index
+        # Get non-zero values of the column and their row indexes
         try:
-            col, col_idx = self.get_vector_from_label(col_label, axis=1)
+            col_data, row_idxs = self._get_nnz_from_label(col_label, axis=1)
         except IndexError:
             raise
         # Largest/smallest occ count for dataset (column), and species (row) labels
         # containing that count.
-        maxval, max_row_labels = self.get_extreme_val_labels_for_vector(
-            col, axis=1, is_max=True)
-        minval, min_row_labels = self.get_extreme_val_labels_for_vector(
-            col, axis=1, is_max=False)
+        maxval, max_row_labels = self._get_extreme_val_labels_from_nnz(
+            col_data, row_idxs, axis=1, is_max=True)
+        minval, min_row_labels = self._get_extreme_val_labels_from_nnz(
+            col_data, row_idxs, axis=1, is_max=False)
 
         # Add dataset titles if column label contains dataset_keys/GUIDs
-        name = self._lookup_dataset_names([col_label])
-        if isinstance(name, dict):
-            stats[self._keys[SNKeys.COL_LABEL]] = name
+        name_map = self._lookup_dataset_names([col_label])
+        if isinstance(name_map, dict):
+            stats[self._keys[SNKeys.COL_LABEL]] = name_map[col_label]
         else:
             stats[self._keys[SNKeys.COL_LABEL]] = col_label
 
         # Count of non-zero rows (Species) within this column (Dataset)
-        stats[self._keys[SNKeys.COL_COUNT]] = self.convert_np_vals_for_json(col.nnz)
+        stats[self._keys[SNKeys.COL_COUNT]] = self.convert_np_vals_for_json(
+            col_data.size)
         # Total Occurrences for Dataset
-        stats[self._keys[SNKeys.COL_TOTAL]] = self.convert_np_vals_for_json(col.sum())
+        stats[self._keys[SNKeys.COL_TOTAL]] = self.convert_np_vals_for_json(
+            col_data.sum())
         # Return min occurrence count in this dataset
         stats[self._keys[SNKeys.COL_MIN_TOTAL]] = self.convert_np_vals_for_json(minval)
         # Return number of species containing same minimum count (too many to list)
@@ -623,11 +836,17 @@ class SparseMatrix(_AggregateDataMatrix):
 
     # ...............................................
     def _lookup_dataset_names(self, labels):
+        # Return labels unchanged if columns are not datasets, otherwise a dictionary
+        #   of {label: name}, using the label if no name exists
         if self._table["column"] != DATASET_GBIF_KEY:
             names = labels
         else:
-            spnet = SpNetAnalyses(PROJ_BUCKET)
-            names = spnet.lookup_dataset_names(labels)
+            names = {lbl: lbl for lbl in labels}
+            if names:
+                spnet = SpNetAnalyses(PROJ_BUCKET)
+                for lbl, name in spnet.lookup_dataset_names(list(names)).items():
+                    if name is not None:
+                        names[lbl] = name
         return names
 
     # ...............................................
@@ -637,83 +856,145 @@ class SparseMatrix(_AggregateDataMatrix):
         Returns:
             all_col_stats (dict): counts and statistics about all columns.
         """
-        # Sum all rows for each column to return a row (numpy.matrix, axis=0)
-        all_totals = self._coo_array.sum(axis=0)
-        # Min total and columns that contain it
-        min_total = all_totals.min()
-        min_total_number = self.count_val_in_vector(all_totals, min_total)
-        # Max total and columns that contain it
-        max_total = all_totals.max()
-        max_total_labels = self.get_labels_for_val_in_vector(
-            all_totals, max_total, axis=0)
-        max_total_names = self._lookup_dataset_names(max_total_labels)
+        k = self._k
+        # Sum and count all columns in one scan of the matrix
+        all_totals, all_counts = self.get_totals_and_counts(axis=0)
+        all_col_stats = self._get_all_column_axis_stats(all_counts)
+        all_col_stats.update(self._get_all_column_value_stats(all_totals))
+
+        # Look up dataset names for all labels in one batch
+        max_count_labels = all_col_stats[k["COLS_MAX_COUNT_LABELS"]]
+        max_total_labels = all_col_stats[k["COLS_MAX_TOTAL_LABELS"]]
+        name_map = self._lookup_dataset_names(max_total_labels + max_count_labels)
+        if isinstance(name_map, dict):
+            all_col_stats[k["COLS_MAX_COUNT_LABELS"]] = {
+                lbl: name_map[lbl] for lbl in max_count_labels}
+            all_col_stats[k["COLS_MAX_TOTAL_LABELS"]] = {
+                lbl: name_map[lbl] for lbl in max_total_labels}
+        return all_col_stats
 
-        # Get number of non-zero rows for every column (row, numpy.ndarray)
-        all_counts = self._coo_array.getnnz(axis=0)
+    # ...............................................
+    def _get_all_column_axis_stats(self, all_counts):
+        # Return stats of the counts of non-zero rows for all columns, given the
+        # number of non-zero rows for every column (1d numpy.ndarray), with labels
+        # (not dataset names) for the columns with the maximum count
+        k = self._k
         # Min count and columns that contain that
         min_count = all_counts.min()
         min_count_number = self.count_val_in_vector(all_counts, min_count)
         # Max count and columns that contain that
         max_count = all_counts.max()
-        max_count_labels = self.get_labels_for_val_in_vector(
-            all_counts, max_count, axis=0)
-        max_count_names = self._lookup_dataset_names(max_count_labels)
+        max_count_labels = self._get_labels_for_val_in_array(
+            all_counts, max_count, axis=1)
 
         # Count rows with at least one non-zero entry (all rows)
         col_count = self._coo_array.shape[1]
-        all_col_stats = {
+        axis_stats = {
             # Count of other axis
-            self._keys[SNKeys.COLS_COUNT]: col_count,
-            self._keys[SNKeys.COLS_MIN_COUNT]:
-                self.convert_np_vals_for_json(min_count),
-            self._keys[SNKeys.COLS_MIN_COUNT_NUMBER]: min_count_number,
+            k["COLS_COUNT"]: col_count,
+            k["COLS_MIN_COUNT"]: self.convert_np_vals_for_json(min_count),
+            k["COLS_MIN_COUNT_NUMBER"]: min_count_number,
 
-            self._keys[SNKeys.COLS_MEAN_COUNT]:
-                self.convert_np_vals_for_json(all_counts.mean()),
-            self._keys[SNKeys.COLS_MEDIAN_COUNT]:
-                self.convert_np_vals_for_json(np.median(all_counts, axis=0)),
+            k["COLS_MEAN_COUNT"]: self.convert_np_vals_for_json(all_counts.mean()),
+            k["COLS_MEDIAN_COUNT"]:
+                self.convert_np_vals_for_json(np.median(all_counts)),
 
-            self._keys[SNKeys.COLS_MAX_COUNT]:
-                self.convert_np_vals_for_json(max_count),
-            self._keys[SNKeys.COLS_MAX_COUNT_LABELS]: max_count_names,
+            k["COLS_MAX_COUNT"]: self.convert_np_vals_for_json(max_count),
+            k["COLS_MAX_COUNT_LABELS"]: max_count_labels,
+        }
+        return axis_stats
 
+    # ...............................................
+    def _get_all_column_value_stats(self, all_totals):
+        # Return stats of the totals of values for all columns, given the 1d array
+        # (one per column) of totals, with labels (not dataset names) for the
+        # columns with the maximum total
+        k = self._k
+        # Min total and columns that contain it
+        min_total = all_totals.min()
+        min_total_number = self.count_val_in_vector(all_totals, min_total)
+        # Max total and columns that contain it
+        max_total = all_totals.max()
+        max_total_labels = self._get_labels_for_val_in_array(
+            all_totals, max_total, axis=1)
+
+        value_stats = {
             # Total occurrences
-            self._keys[SNKeys.COLS_TOTAL]:
-                self.convert_np_vals_for_json(all_totals.sum()),
-            self._keys[SNKeys.COLS_MIN_TOTAL]:
-                self.convert_np_vals_for_json(min_total),
-            self._keys[SNKeys.COLS_MIN_TOTAL_NUMBER]: min_total_number,
-
-            self._keys[SNKeys.COLS_MEAN_TOTAL]:
-                self.convert_np_vals_for_json(all_totals.mean()),
-            self._keys[SNKeys.COLS_MEDIAN_TOTAL]:
-                self.convert_np_vals_for_json(np.median(all_totals, axis=1)[0, 0]),
-
-            self._keys[SNKeys.COLS_MAX_TOTAL]: self.convert_np_vals_for_json(max_total),
-            self._keys[SNKeys.COLS_MAX_TOTAL_LABELS]: max_total_names,
+            k["COLS_TOTAL"]: self.convert_np_vals_for_json(all_totals.sum()),
+            k["COLS_MIN_TOTAL"]: self.convert_np_vals_for_json(min_total),
+            k["COLS_MIN_TOTAL_NUMBER"]: min_total_number,
+
+            k["COLS_MEAN_TOTAL"]: self.convert_np_vals_for_json(all_totals.mean()),
+            k["COLS_MEDIAN_TOTAL"]:
+                self.convert_np_vals_for_json(np.median(all_totals)),
+
+            k["COLS_MAX_TOTAL"]: self.convert_np_vals_for_json(max_total),
+            k["COLS_MAX_TOTAL_LABELS"]: max_total_labels,
         }
-        return all_col_stats
+        return value_stats
+
+    # ...............................................
+    def _get_axis_coords(self, axis):
+        # Return the column (axis 0) or row (axis 1) coordinate of each non-zero
+        # element, and the number of columns or rows
+        if axis == 0:
+            coords = self._coo_array.col
+            size = self._coo_array.shape[1]
+        elif axis == 1:
+            coords = self._coo_array.row
+            size = self._coo_array.shape[0]
+        else:
+            raise Exception(f"2D sparse array does not have axis {axis}")
+        return coords, size
+
+    # ...............................................
+    def _sum_by_coords(self, coords, size):
+        # Sum values by coordinate in a single pass over the data
+        totals = np.bincount(coords, weights=self._coo_array.data, minlength=size)
+        # bincount sums weights as floats, return integer counts as integers, in the
+        #   dtype np.sum promotes to, so totals of narrow integers do not overflow
+        if np.issubdtype(self._coo_array.dtype, np.integer):
+            sum_dtype = np.add.reduce(self._coo_array.data[:0]).dtype
+            totals = totals.astype(sum_dtype)
+        return totals
 
     # ...............................................
     def get_totals(self, axis):
-        """Get a list of totals along the requested axis, down axis 0, across axis 1.
+        """Get totals along the requested axis, down axis 0, across axis 1.
 
         Args:
             axis (int): Axis to sum.
 
         Returns:
-            all_totals (list): list of values for the axis.
+            all_totals (numpy.ndarray): 1d array of totals for the axis.
+
+        Raises:
+            Exception: on axis not in (0, 1)
         """
-        mtx = self._coo_array.sum(axis=axis)
-        # 2d Matrix is a list of rows
-        # Axis 0 produces a matrix shape (1, col_count), 1 row
-        # Axis 1 produces matrix shape (row_count, 1), row_count rows
-        if axis == 0:
-            all_totals = mtx.tolist()[0]
-        elif axis == 1:
-            all_totals = mtx.T.tolist()[0]
+        coords, size = self._get_axis_coords(axis)
+        all_totals = self._sum_by_coords(coords, size)
         return all_totals
 
+    # ...............................................
+    def get_totals_and_counts(self, axis):
+        """Get totals and non-zero counts along the requested axis in one scan.
+
+        Args:
+            axis (int): Axis to sum and count non-zero values for, down axis 0,
+                across axis 1.
+
+        Returns:
+            all_totals (numpy.ndarray): 1d array of totals for the axis.
+            all_counts (numpy.ndarray): 1d array of counts for the axis.
+
+        Raises:
+            Exception: on axis not in (0, 1)
+        """
+        coords, size = self._get_axis_coords(axis)
+        all_totals = self._sum_by_coords(coords, size)
+        all_counts = np.bincount(coords, minlength=size)
+        return all_totals, all_counts
+
     # ...............................................
     def get_counts(self, axis):
         """Count non-zero values along the requested axis, down axis 0, across axis 1.
@@ -722,11 +1003,37 @@ class SparseMatrix(_AggregateDataMatrix):
             axis (int): Axis to count non-zero values for.
 
         Returns:
-            all_counts (list): list of values for the axis.
+            all_counts (numpy.ndarray): 1d array of counts for the axis.
+
+        Raises:
+            Exception: on axis not in (0, 1)
         """
-        all_counts = self._coo_array.getnnz(axis=axis)
+        coords, size = self._get_axis_coords(axis)
+        all_counts = np.bincount(coords, minlength=size)
         return all_counts
 
+    # ...............................................
+    def _get_stats_for_comparison(self, axis, agg_type):
+        # Return the compared count ("axis") or total ("value") stats of all columns
+        # (axis 0) or all rows (axis 1), computed once, as the matrix does not change
+        key = (axis, agg_type)
+        if key not in self._all_stats:
+            if agg_type == "axis":
+                all_counts = self.get_counts(axis=axis)
+                if axis == 0:
+                    stats = self._get_all_column_axis_stats(all_counts)
+                else:
+                    stats = self._get_all_row_axis_stats(all_counts)
+            else:
+                all_totals = self.get_totals(axis=axis)
+                if axis == 0:
+                    stats = self._get_all_column_value_stats(all_totals)
+                else:
+                    stats = self._get_all_row_value_stats(all_totals)
+            keystrs = [self._k[name] for name in _COMPARISON_KEYS[key]]
+            self._all_stats[key] = {keystr: stats[keystr] for keystr in keystrs}
+        return self._all_stats[key]
+
     # ...............................................
     def compare_column_to_others(self, col_label, agg_type=None):
         """Compare the number of rows and counts in rows to those of other columns.
@@ -738,36 +1045,57 @@ class SparseMatrix(_AggregateDataMatrix):
 
         Returns:
             comparisons (dict): comparison measures
+
+        Raises:
+            IndexError: on label not found in data.
         """
-        # Get this column stats
-        stats = self.get_one_column_stats(col_label)
-        # Show this column totals and counts compared to min, max, mean of all columns
-        all_stats = self.get_all_column_stats()
-        comparisons = {self._keys[SNKeys.COL_TYPE]: col_label}
+        # Get this column's non-zero values by slicing the CSC matrix, without the
+        # extreme values and dataset name lookup of get_one_column_stats
+        try:
+            col_data, _row_idxs = self._get_nnz_from_label(col_label, axis=1)
+        except IndexError:
+            raise
+        # Show this column totals and counts compared to min, max, mean of all columns,
+        # computing only the stats requested by agg_type
+        k = self._k
+        comparisons = {k["COL_TYPE"]: col_label}
         if agg_type in ("value", None):
             comparisons["Occurrences"] = {
-                self._keys[SNKeys.COL_TOTAL]: stats[self._keys[SNKeys.COL_TOTAL]],
-                self._keys[SNKeys.COLS_TOTAL]: all_stats[self._keys[SNKeys.COLS_TOTAL]],
-                self._keys[SNKeys.COLS_MIN]: all_stats[self._keys[SNKeys.COLS_MIN]],
-                self._keys[SNKeys.COLS_MAX]: all_stats[self._keys[SNKeys.COLS_MAX]],
-                self._keys[SNKeys.COLS_MEAN]: all_stats[self._keys[SNKeys.COLS_MEAN]],
-                self._keys[SNKeys.COLS_MEDIAN]: all_stats[self._keys[SNKeys.COLS_MEDIAN]]
+                k["COL_TOTAL"]: self.convert_np_vals_for_json(col_data.sum()),
+                **self._get_stats_for_comparison(0, "value")
             }
         if agg_type in ("axis", None):
             comparisons["Species"] = {
-                self._keys[SNKeys.COL_COUNT]: stats[self._keys[SNKeys.COL_COUNT]],
-                self._keys[SNKeys.COLS_COUNT]: all_stats[self._keys[SNKeys.COLS_COUNT]],
-                self._keys[SNKeys.COLS_COUNT_MIN]:
-                    all_stats[self._keys[SNKeys.COLS_COUNT_MIN]],
-                self._keys[SNKeys.COLS_COUNT_MAX]:
-                    all_stats[self._keys[SNKeys.COLS_COUNT_MAX]],
-                self._keys[SNKeys.COLS_COUNT_MEAN]:
-                    all_stats[self._keys[SNKeys.COLS_COUNT_MEAN]],
-                self._keys[SNKeys.COLS_COUNT_MEDIAN]:
-                    all_stats[self._keys[SNKeys.COLS_COUNT_MEDIAN]]
+                k["COL_COUNT"]: col_data.size,
+                **self._get_stats_for_comparison(0, "axis")
             }
         return comparisons
 
+    # ...............................................
+    def compare_columns_to_others(self, col_labels, agg_type=None):
+        """Compare each of several columns to all other columns.
+
+        Args:
+            col_labels (list): labels of the columns to compare.
+            agg_type: return stats on rows or values.  If None, return both.
+                (options: "axis", "value", None)
+
+        Returns:
+            comparisons (list of dict): comparison measures for each column, in the
+                order of col_labels.
+
+        Raises:
+            IndexError: on label not found in data.
+
+        Note:
+            Stats of all columns are computed once for the batch, then each column
+                is read from the CSC matrix.
+        """
+        comparisons = [
+            self.compare_column_to_others(col_label, agg_type=agg_type)
+            for col_label in col_labels]
+        return comparisons
+
     # ...............................................
     def compare_row_to_others(self, row_label, agg_type=None):
         """Compare the number of columns and counts in columns to those of other rows.
@@ -779,36 +1107,57 @@ class SparseMatrix(_AggregateDataMatrix):
 
         Returns:
             comparisons (dict): comparison measures
+
+        Raises:
+            IndexError: on label not found in data.
         """
-        stats = self.get_one_row_stats(row_label)
-        # Show this column totals and counts compared to min, max, mean of all columns
-        all_stats = self.get_all_row_stats()
-        comparisons = {self._keys[SNKeys.ROW_TYPE]: row_label}
+        # Get this row's non-zero values by slicing the CSR matrix, without the
+        # extreme values and dataset name lookup of get_one_row_stats
+        try:
+            row_data, _col_idxs = self._get_nnz_from_label(row_label, axis=0)
+        except IndexError:
+            raise
+        # Show this row totals and counts compared to min, max, mean of all rows,
+        # computing only the stats requested by agg_type
+        k = self._k
+        comparisons = {k["ROW_TYPE"]: row_label}
         if agg_type in ("value", None):
             comparisons["Occurrences"] = {
-                self._keys[SNKeys.ROW_TOTAL]: stats[self._keys[SNKeys.ROW_TOTAL]],
-                self._keys[SNKeys.ROWS_TOTAL]: all_stats[self._keys[SNKeys.ROWS_TOTAL]],
-                self._keys[SNKeys.ROWS_MIN]: all_stats[self._keys[SNKeys.ROWS_MIN]],
-                self._keys[SNKeys.ROWS_MAX]: all_stats[self._keys[SNKeys.ROWS_MAX]],
-                self._keys[SNKeys.ROWS_MEAN]: all_stats[self._keys[SNKeys.ROWS_MEAN]],
-                self._keys[SNKeys.ROWS_MEDIAN]:
-                    all_stats[self._keys[SNKeys.ROWS_MEDIAN]],
+                k["ROW_TOTAL"]: self.convert_np_vals_for_json(row_data.sum()),
+                **self._get_stats_for_comparison(1, "value")
             }
         if agg_type in ("axis", None):
             comparisons["Datasets"] = {
-                self._keys[SNKeys.ROW_COUNT]: stats[self._keys[SNKeys.ROW_COUNT]],
-                self._keys[SNKeys.ROWS_COUNT]: all_stats[self._keys[SNKeys.ROWS_COUNT]],
-                self._keys[SNKeys.ROWS_COUNT_MIN]:
-                    all_stats[self._keys[SNKeys.ROWS_COUNT_MIN]],
-                self._keys[SNKeys.ROWS_COUNT_MAX]:
-                    all_stats[self._keys[SNKeys.ROWS_COUNT_MAX]],
-                self._keys[SNKeys.ROWS_COUNT_MEAN]:
-                    all_stats[self._keys[SNKeys.ROWS_COUNT_MEAN]],
-                self._keys[SNKeys.ROWS_COUNT_MEDIAN]:
-                    all_stats[self._keys[SNKeys.ROWS_COUNT_MEDIAN]]
+                k["ROW_COUNT"]: row_data.size,
+                **self._get_stats_for_comparison(1, "axis")
             }
         return comparisons
 
+    # ...............................................
+    def compare_rows_to_others(self, row_labels, agg_type=None):
+        """Compare each of several rows to all other rows.
+
+        Args:
+            row_labels (list): labels of the rows to compare.
+            agg_type: return stats on rows or values.  If None, return both.
+                (options: "axis", "value", None)
+
+        Returns:
+            comparisons (list of dict): comparison measures for each row, in the
+                order of row_labels.
+
+        Raises:
+            IndexError: on label not found in data.
+
+        Note:
+            Stats of all rows are computed once for the batch, then each row is read
+                from the CSR matrix.
+        """
+        comparisons = [
+            self.compare_row_to_others(row_label, agg_type=agg_type)
+            for row_label in row_labels]
+        return comparisons
+
     # .............................................................................
     def compress_to_file(self, local_path="/tmp"):
         """Compress this SparseMatrix to a zipped npz and json file.
@@ -820,43 +1169,66 @@ class SparseMatrix(_AggregateDataMatrix):
             zip_fname (str): Local output zip filename.
 
         Raises:
-            Exception: on failure to write sparse matrix to NPZ file.
-            Exception: on failure to serialize or write metadata.
-            Exception: on failure to write matrix and metadata files to zipfile.
+            Exception: on failure to write matrix and metadata to zipfile.
+
+        Note:
+            The COO data, row and column arrays are written as raw binary npy members
+                of an uncompressed npz, straight from the array buffers, rather than a
+                text format such as Matrix Market.  This avoids formatting each value
+                on write, and lets read_data memory-map the arrays instead of parsing.
+
+        Note:
+            Row and column labels are saved in the npz as UTF-8 byte arrays with
+                label offsets, so the JSON metadata contains only table information.
+
+        Note:
+            The bundle remains a zipfile, which read_data and the analyst service
+                expect, compressed with fast level 1 deflate.  Summary matrices are
+                written to parquet with zstd compression, and stored in their zipfile
+                without a second compression pass.
         """
         # Always delete local files before compressing this data.
         [mtx_fname, meta_fname, zip_fname] = self._remove_expected_files(
             local_path=local_path)
 
-        # Save matrix to npz locally
+        # Table data, serialized to json on construction
+        metastr = self._table_meta_json
+
+        # Save matrix in scipy.sparse npz format, with row and column labels
+        row_labels, row_label_offsets = _encode_labels(self._row_labels)
+        col_labels, col_label_offsets = _encode_labels(self._col_labels)
+        coo = self._coo_array
+        # Order elements by row, then column, so row coordinates are runs of repeated
+        # values and column coordinates are ascending, which zip compresses far better
+        order = np.lexsort((coo.col, coo.row))
+
+        # Stream an uncompressed npz and the metadata directly into the zipfile, so
+        # zip compression is the only compression pass and no temp files are written
         try:
-            scipy.sparse.save_npz(mtx_fname, self._coo_array, compressed=True)
+            with ZipFile(
+                    zip_fname, "w", compression=ZIP_DEFLATED, compresslevel=1
+            ) as zip:
+                with zip.open(
+                        os.path.basename(mtx_fname), "w", force_zip64=True
+                ) as mtxf:
+                    np.savez(
+                        mtxf, format=b"coo", shape=coo.shape, data=coo.data[order],
+                        row=coo.row[order], col=coo.col[order],
+                        row_labels=row_labels, row_label_offsets=row_label_offsets,
+                        col_labels=col_labels, col_label_offsets=col_label_offsets)
+                zip.writestr(os.path.basename(meta_fname), metastr)
         except Exception as e:
-            msg = f"Failed to write {mtx_fname}: {e}"
+            msg = f"Failed to write {zip_fname}: {e}"
             self._logme(msg, log_level=ERROR)
             raise Exception(msg)
 
-        # Save table data and categories to json locally
-        metadata = Summaries.get_table(self._table_type)
-        metadata["row"] = self._row_categ.categories.tolist()
-        metadata["column"] = self._col_categ.categories.tolist()
-        try:
-            self._dump_metadata(metadata, meta_fname)
-        except Exception:
-            raise
-
-        # Compress matrix with metadata
-        try:
-            self._compress_files([mtx_fname, meta_fname], zip_fname)
-        except Exception:
-            raise
-
         return zip_fname
 
     # .............................................................................
     @classmethod
     def uncompress_zipped_data(
-            cls, zip_filename, local_path="/tmp", overwrite=False):
+            cls, zip_filename, local_path="/tmp", overwrite=False,
+            with_categories=True):
         """Uncompress a zipped SparseMatrix into a coo_array and row/column categories.
 
         Args:
@@ -864,11 +1236,15 @@ class SparseMatrix(_AggregateDataMatrix):
             local_path (str): Absolute path of local destination path
             overwrite (bool): Flag indicating whether to use existing files unzipped
                 from the zip_filename.
+            with_categories (bool): Flag indicating whether to return row and column
+                labels as CategoricalDtype objects, or as arrays of labels.
 
         Returns:
             sparse_coo (scipy.sparse.coo_array): Sparse Matrix containing data.
-            row_categ (pandas.api.types.CategoricalDtype): row categories
-            col_categ (pandas.api.types.CategoricalDtype): column categories
+            row_categ (pandas.api.types.CategoricalDtype): row categories, or an array
+                of row labels if with_categories is False
+            col_categ (pandas.api.types.CategoricalDtype): column categories, or an
+                array of column labels if with_categories is False
             table_type (sppy.tools.s2n.constants.SUMMARY_TABLE_TYPES): type of table
                 data
             data_datestr (str): date string in format YYYY_MM_DD
@@ -889,7 +1265,8 @@ class SparseMatrix(_AggregateDataMatrix):
             raise
 
         try:
-            sparse_coo, row_categ, col_categ = cls.read_data(mtx_fname, meta_fname)
+            sparse_coo, row_categ, col_categ = cls.read_data(
+                mtx_fname, meta_fname, with_categories=with_categories)
         except Exception:
             raise
 
@@ -897,17 +1274,23 @@ class SparseMatrix(_AggregateDataMatrix):
 
     # .............................................................................
     @classmethod
-    def read_data(cls, mtx_filename, meta_filename):
+    def read_data(cls, mtx_filename, meta_filename, with_categories=True):
         """Read SparseMatrix data files into a coo_array and row/column categories.
 
         Args:
             mtx_filename (str): Filename of scipy.sparse.coo_array data in npz format.
             meta_filename (str): Filename of JSON sparse matrix metadata.
+            with_categories (bool): Flag indicating whether to return row and column
+                labels as CategoricalDtype objects, or as arrays of labels.  Skip
+                building categories, which hashes every label, when only the matrix
+                values are needed.
 
         Returns:
             sparse_coo (scipy.sparse.coo_array): Sparse Matrix containing data.
-            row_categ (pandas.api.types.CategoricalDtype): row categories
-            col_categ (pandas.api.types.CategoricalDtype): column categories
+            row_categ (pandas.api.types.CategoricalDtype): row categories, or an array
+                of row labels if with_categories is False
+            col_categ (pandas.api.types.CategoricalDtype): column categories, or an
+                array of column labels if with_categories is False
             table_type (sppy.tools.s2n.constants.SUMMARY_TABLE_TYPES): type of table
                 data
             data_datestr (str): date string in format YYYY_MM_DD
@@ -922,31 +1305,39 @@ class SparseMatrix(_AggregateDataMatrix):
             All filenames have the same basename with extensions indicating which data
                 they contain. The filename contains a string like YYYY-MM-DD which
                 indicates which GBIF data dump the statistics were built upon.
+
+        Note:
+            Row and column labels are read from the npz file.  The JSON metadata is
+                read for labels only for matrices saved without them in the npz.
         """
-        # Read sparse matrix from npz file
+        # Read sparse matrix and labels from npz file, memory-mapped if uncompressed
         try:
-            sparse_coo = scipy.sparse.load_npz(mtx_filename)
+            sparse_coo = _load_npz_coo_mmap(mtx_filename)
+            row_catlst, col_catlst = _load_npz_labels(mtx_filename)
         except Exception as e:
             raise Exception(f"Failed to load {mtx_filename}: {e}")
 
-        # Read JSON dictionary as string
-        try:
-            meta_dict = cls.load_metadata(meta_filename)
-        except Exception:
-            raise
+        if row_catlst is None or col_catlst is None:
+            # Read JSON dictionary as string
+            try:
+                meta_dict = cls.load_metadata(meta_filename)
+            except Exception:
+                raise
 
-        # Parse metadata into objects for matrix construction
-        try:
-            row_catlst = meta_dict.pop("row")
-        except KeyError:
-            raise Exception(f"Missing row categories in {meta_filename}")
-        else:
-            row_categ = CategoricalDtype(row_catlst, ordered=True)
-        try:
-            col_catlst = meta_dict.pop("column")
-        except KeyError:
-            raise Exception(f"Missing column categories in {meta_filename}")
-        else:
-            col_categ = CategoricalDtype(col_catlst, ordered=True)
+            # Parse metadata into objects for matrix construction
+            try:
+                row_catlst = np.array(meta_dict.pop("row"), dtype=object)
+            except KeyError:
+                raise Exception(f"Missing row categories in {meta_filename}")
+            try:
+                col_catlst = np.array(meta_dict.pop("column"), dtype=object)
+            except KeyError:
+                raise Exception(f"Missing column categories in {meta_filename}")
+
+        if with_categories is False:
+            return sparse_coo, row_catlst, col_catlst
+
+        row_categ = CategoricalDtype(row_catlst, ordered=True)
+        col_categ = CategoricalDtype(col_catlst, ordered=True)
 
         return sparse_coo, row_categ, col_categ
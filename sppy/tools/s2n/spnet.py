@@ -1,6 +1,6 @@
 """Class to query tabular summary Specify Network data in S3."""
 import boto3
-import json
+import orjson
 import pandas as pd
 
 from sppy.aws.aws_constants import (
@@ -132,7 +132,7 @@ class SpNetAnalyses():
                 rec_strings = recs_str.strip().split("\n")
                 for rs in rec_strings:
                     if format == "JSON":
-                        rec = json.loads(rs)
+                        rec = orjson.loads(rs)
                     else:
                         rec = rs.split(",")
                     recs.append(rec)
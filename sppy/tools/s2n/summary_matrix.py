@@ -1,14 +1,68 @@
 """Matrix to summarize each of 2 dimensions of data by counts of the other and a third."""
 from collections import OrderedDict
+from io import BytesIO
 from logging import ERROR
+import numpy as np
+import os
 import pandas as pd
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
 from sppy.tools.s2n.aggregate_data_matrix import _AggregateDataMatrix
-from sppy.tools.s2n.constants import (
-    MATRIX_SEPARATOR, SNKeys, SUMMARY_FIELDS, Summaries)
+from sppy.tools.s2n.constants import MATRIX_SEPARATOR, SNKeys, SUMMARY_FIELDS
 from sppy.tools.util.logtools import logit
 
 
+# .............................................................................
+def _top_k_positions(vals, limit, descending=True):
+    """Find positions of the limit largest or smallest values, in sorted order.
+
+    Args:
+        vals (numpy.ndarray): 1d array of values to rank.
+        limit (int): number of positions to return, plus any tied with the last.
+        descending (bool): True to return largest values first, False for smallest.
+
+    Returns:
+        idxs (numpy.ndarray): positions of the selected values, sorted by value, with
+            ties in their original order.
+
+    Note:
+        Partitioning (O(N)) finds the limit-th value, then only the values up to and
+            including it are sorted, keeping all ties as nlargest(keep="all") does.
+            When all values are selected, they are sorted directly.
+    """
+    count = min(limit, vals.size)
+    if count < 1:
+        idxs = np.empty(0, dtype=np.intp)
+    elif count == vals.size:
+        if descending:
+            idxs = _argsort_descending(vals)
+        else:
+            idxs = np.argsort(vals, kind="stable")
+    # Get largest and down
+    elif descending:
+        kth_pos = vals.size - count
+        kth = np.partition(vals, kth_pos)[kth_pos]
+        idxs = np.flatnonzero(vals >= kth)
+        # Sort only the few selected values
+        idxs = idxs[_argsort_descending(vals[idxs])]
+    # Get smallest and up
+    else:
+        kth = np.partition(vals, count - 1)[count - 1]
+        idxs = np.flatnonzero(vals <= kth)
+        idxs = idxs[np.argsort(vals[idxs], kind="stable")]
+    return idxs
+
+
+# .............................................................................
+def _argsort_descending(vals):
+    # Stable descending sort, with ties in their original order, without negating
+    #   values, which wraps around for unsigned integers.  A stable ascending sort of
+    #   the reversed values, reversed again, gives positions in the reversed array.
+    rev_idxs = np.argsort(vals[::-1], kind="stable")[::-1]
+    idxs = vals.size - 1 - rev_idxs
+    return idxs
+
+
 # .............................................................................
 class SummaryMatrix(_AggregateDataMatrix):
     """Class for holding summary counts of each of 2 dimensions of data."""
@@ -31,6 +85,10 @@ class SummaryMatrix(_AggregateDataMatrix):
         """
         self._df = summary_df
         _AggregateDataMatrix.__init__(self, table_type, data_datestr, logger=logger)
+        # Measurement fields, ordered for ranking by each field: sort field first
+        fields = self._table["fields"]
+        self._rank_fields = {
+            fld: [fld] + [other for other in fields if other != fld] for fld in fields}
 
     # ...........................
     @classmethod
@@ -57,11 +115,11 @@ class SummaryMatrix(_AggregateDataMatrix):
         """
         # Column counts and totals (count along axis 0, each row)
         # Row counts and totals (count along axis 1, each column)
-        totals = sp_mtx.get_totals(axis=axis)
-        counts = sp_mtx.get_counts(axis=axis)
-        data = {SUMMARY_FIELDS.COUNT: counts, SUMMARY_FIELDS.TOTAL: totals}
-        input_table_meta = Summaries.get_table(sp_mtx.table_type)
+        totals, counts = sp_mtx.get_totals_and_counts(axis=axis)
+        input_table_meta = sp_mtx.table_meta
 
+        # The index is the categories Index of the matrix's CategoricalDtype, used as
+        # is by the DataFrame, so its label hashtable is shared rather than rebuilt
         # Axis 0 summarizes each column (down axis 0) of sparse matrix
         if axis == 0:
             index = sp_mtx.column_category.categories
@@ -71,11 +129,43 @@ class SummaryMatrix(_AggregateDataMatrix):
             index = sp_mtx.row_category.categories
             table_type = input_table_meta["row_summary_table"]
 
-        # summary fields = columns, sparse matrix axis = rows
-        sdf = pd.DataFrame(data=data, index=index)
+        summary_matrix = SummaryMatrix.init_from_arrays(
+            counts, totals, index, table_type, sp_mtx.data_datestr, logger=logger)
+        return summary_matrix
+
+    # ...........................
+    @classmethod
+    def init_from_arrays(
+            cls, counts, totals, labels, table_type, data_datestr, logger=None):
+        """Create a summary matrix from arrays of counts and totals for each label.
+
+        Args:
+            counts (numpy.ndarray): 1d array of the count of each labeled item.
+            totals (numpy.ndarray): 1d array of the total of each labeled item.
+            labels (sequence): labels of the items, in the same order.
+            table_type (aws_constants.SUMMARY_TABLE_TYPES): type of aggregated data
+            data_datestr (str): date of the source data in YYYY_MM_DD format.
+            logger (object): logger for saving relevant processing messages
+
+        Returns:
+            summary_matrix (SummaryMatrix): matrix summarizing labeled items by count
+                and total.
 
-        summary_matrix = SummaryMatrix(
-            sdf, table_type, sp_mtx.data_datestr, logger=logger)
+        Note:
+            Counts are pinned to int64 and totals keep their own dtype, so integer
+                counts are not upcast to match float totals.  Each array is used as its
+                column's storage without copying, so each measurement is stored
+                contiguously (structure of arrays).
+        """
+        # summary fields = columns, labels = rows
+        sdf = pd.DataFrame(
+            data={
+                SUMMARY_FIELDS.COUNT: np.asarray(counts, dtype=np.int64),
+                SUMMARY_FIELDS.TOTAL: np.asarray(totals)
+            },
+            index=labels, copy=False)
+
+        summary_matrix = SummaryMatrix(sdf, table_type, data_datestr, logger=logger)
         return summary_matrix
 
     # ...............................................
@@ -108,16 +198,15 @@ class SummaryMatrix(_AggregateDataMatrix):
         Returns:
             labels (list): random row headers
         """
-        import random
         size = len(self._df.index)
         # Get a random sample of category indexes (0-based)
-        idxs = random.sample(range(size), count)
-        labels = [self._df.index(i) for i in idxs]
+        idxs = np.random.default_rng().choice(size, count, replace=False)
+        labels = self._df.index.take(idxs).tolist()
         return labels
 
     # .............................................................................
     def compress_to_file(self, local_path="/tmp"):
-        """Compress this SparseMatrix to a zipped npz and json file.
+        """Compress this SummaryMatrix to a zipped parquet and json file.
 
         Args:
             local_path (str): Absolute path of local destination path
@@ -126,34 +215,37 @@ class SummaryMatrix(_AggregateDataMatrix):
             zip_fname (str): Local output zip filename.
 
         Raises:
-            Exception: on failure to write dataframe to CSV file.
-            Exception: on failure to serialize or write metadata as JSON.
-            Exception: on failure to write matrix and metadata files to zipfile.
+            Exception: on failure to write dataframe to parquet.
+            Exception: on failure to write matrix and metadata to zipfile.
         """
         # Always delete local files before compressing this data.
         [mtx_fname, meta_fname, zip_fname] = self._remove_expected_files(
             local_path=local_path)
 
-        # Save matrix to csv locally
+        # Serialize matrix to binary columnar parquet in memory
         try:
-            self._df.to_csv(mtx_fname, sep=MATRIX_SEPARATOR)
+            mtx_buf = BytesIO()
+            self._df.to_parquet(
+                mtx_buf, engine="pyarrow", compression="zstd", index=True)
         except Exception as e:
             msg = f"Failed to write {mtx_fname}: {e}"
             self._logme(msg, log_level=ERROR)
             raise Exception(msg)
 
-        # Save table data and categories to json locally
-        metadata = Summaries.get_table(self._table_type)
+        # Write the parquet matrix (already compressed) and the metadata directly into
+        # the zipfile, so no temp files are written and re-read
         try:
-            self._dump_metadata(metadata, meta_fname)
-        except Exception:
-            raise
-
-        # Compress matrix with metadata
-        try:
-            self._compress_files([mtx_fname, meta_fname], zip_fname)
-        except Exception:
-            raise
+            with ZipFile(zip_fname, "w", allowZip64=True) as zip:
+                zip.writestr(
+                    os.path.basename(mtx_fname), mtx_buf.getbuffer(),
+                    compress_type=ZIP_STORED)
+                zip.writestr(
+                    os.path.basename(meta_fname), self._table_meta_json,
+                    compress_type=ZIP_DEFLATED)
+        except Exception as e:
+            msg = f"Failed to write {zip_fname}: {e}"
+            self._logme(msg, log_level=ERROR)
+            raise Exception(msg)
 
         return zip_fname
 
@@ -199,7 +291,8 @@ class SummaryMatrix(_AggregateDataMatrix):
         """Read SummaryMatrix data files into a dataframe and metadata dictionary.
 
         Args:
-            mtx_filename (str): Filename of pandas.DataFrame data in csv format.
+            mtx_filename (str): Filename of pandas.DataFrame data in parquet format, or
+                in CSV format for older data, identified by the file extension.
             meta_filename (str): Filename of JSON summary matrix metadata.
 
         Returns:
@@ -209,12 +302,18 @@ class SummaryMatrix(_AggregateDataMatrix):
             data_datestr (str): date string in format YYYY_MM_DD
 
         Raises:
-            Exception: on unable to load CSV file
+            Exception: on unable to load parquet or CSV file
             Exception: on unable to load JSON metadata
         """
-        # Read dataframe from local CSV file
+        # Read dataframe from local parquet file, or CSV file in older archives
+        _, mtx_ext = os.path.splitext(mtx_filename)
         try:
-            dataframe = pd.read_csv(mtx_filename, sep=MATRIX_SEPARATOR, index_col=0)
+            if mtx_ext == ".csv":
+                dataframe = pd.read_csv(
+                    mtx_filename, sep=MATRIX_SEPARATOR, index_col=0)
+            else:
+                dataframe = pd.read_parquet(
+                    mtx_filename, engine="pyarrow", memory_map=True)
         except Exception as e:
             raise Exception(f"Failed to load {mtx_filename}: {e}")
         # Read JSON dictionary as string
@@ -262,31 +361,24 @@ class SummaryMatrix(_AggregateDataMatrix):
         Raises:
             Exception: on sort field does not exist in data.
         """
-        measure_flds = self._keys["fields"].copy()
         try:
-            measure_flds.remove(sort_by)
-        except ValueError:
+            fields = self._rank_fields[sort_by]
+        except KeyError:
             raise Exception(
-                f"Field {sort_by} does not exist; sort by one of {self._keys['fields']}")
-        # Get largest and down
-        if order == "descending":
-            sorted_df = self._df.nlargest(limit, sort_by, keep="all")
-        # Get smallest and up
-        elif order == "ascending":
-            sorted_df = self._df.nsmallest(limit, sort_by, keep="all")
-        else:
+                f"Field {sort_by} does not exist; sort by one of "
+                f"{self._table['fields']}")
+        if order not in ("descending", "ascending"):
             raise Exception(
-                f"Order {sort_by} does not exist, use 'ascending' or 'descending')")
-        # Returns dict with each measurement in a separate dictionary, so re-arrange
-        rec_dict = sorted_df.to_dict()
-        ordered_rec_dict = OrderedDict()
-        # Create records from the sorted measurement first, in order returned
-        for k, v in rec_dict[sort_by]:
-            ordered_rec_dict[k] = {sort_by: v}
-            # measure_flds now contains all fields except sort_by
-            #   add remaining fields and values to the new ordered records
-            for other_fld in measure_flds:
-                ordered_rec_dict[k][other_fld] = rec_dict[other_fld][k]
+                f"Order {order} does not exist, use 'ascending' or 'descending'")
+        vals = self._df[sort_by].to_numpy()
+        idxs = _top_k_positions(vals, limit, descending=(order == "descending"))
+        # Gather the selected values of each field in one call per column, keeping
+        #   each column's type, rather than building an intermediate DataFrame
+        labels = self._df.index.take(idxs).tolist()
+        columns = [self._df[fld].to_numpy()[idxs].tolist() for fld in fields]
+        # Records keyed by row label, in sorted order, with sort_by as the first field
+        ordered_rec_dict = OrderedDict(
+            (label, dict(zip(fields, rec))) for label, rec in zip(labels, zip(*columns)))
         return ordered_rec_dict
 
     # ...............................................
@@ -1,7 +1,12 @@
 """Tools for downloading, saving, reading a Darwin Core Archive file."""
+from concurrent.futures import as_completed, ThreadPoolExecutor
+import copy
+import csv
+import functools
 from logging import ERROR
 import os
 import requests
+import shutil
 import xml.etree.ElementTree as ET
 import zipfile
 
@@ -13,6 +18,23 @@ from sppy.tools.util.utils import is_valid_uuid
 from sppy.tools.util.logtools import Logger, logit
 
 INCR_KEY = 0
+# Block size for streaming downloads and extracted files to disk
+COPY_BUFFER_SIZE = 1 << 20
+# Maximum number of filenames listed in a log message
+MAX_LOGGED_NAMES = 20
+# Fields of a DwC record combined into a collection date, in order
+DATE_KEYS = ("year", "month", "day")
+# Escaped characters in meta.xml attributes, and the characters they represent
+ESCAPED_CHARS = {"\\t": "\t", "\\n": "\n"}
+# Namespaced meta.xml element tags, built once
+CORE_TAG = f"{DWCA.NS}core"
+EXTENSION_TAG = f"{DWCA.NS}extension"
+FILES_TAG = f"{DWCA.NS}files"
+FIELD_TAG = f"{DWCA.NS}field"
+LOCATION_TAG = f"{DWCA.NS}{DWCA.LOCATION_KEY}"
+# Path from the core element to the location of the core data file
+CORE_LOCATION_PATH = f"{FILES_TAG}/{LOCATION_TAG}"
+UUID_TAG = f"{DWCA.NS}{DWCA.UUID_KEY}"
 #
 # # Pull dataset/record guids from specify RSS
 # rurl = (
@@ -85,20 +107,13 @@ def assemble_download_filename(url, baseoutpath):
             different datasets would be overwritten.
     """
     if url.endswith(".zip"):
-        _, fname = os.path.split(url)
-        basename, _ = os.path.splitext(fname)
-        outpath = os.path.join(baseoutpath, basename)
-        outfilename = os.path.join(outpath, fname)
+        fname = url.rpartition("/")[2]
+        basename = fname[:-len(".zip")]
+        outfilename = os.path.join(baseoutpath, basename, fname)
     else:
-        # IPT link does not contain filename
-        idx = url.find("r=")
-        tmp = url[idx+2:]
-        parts = tmp.split("&")
-        if len(parts) == 1:
-            name = tmp
-        else:
-            name = ".".join(parts)
-        outfilename = os.path.join(baseoutpath, name, "{}.zip".format(name))
+        # IPT link does not contain filename, use query parameters after "r="
+        name = url[url.find("r=") + 2:].replace("&", ".")
+        outfilename = os.path.join(baseoutpath, name, f"{name}.zip")
     return outfilename
 
 
@@ -121,33 +136,204 @@ def download_dwca(url, baseoutpath, overwrite=False, logger=None):
         logit(
             logger, f"File {outfilename} is not ready for writing",
             refname="download_dwca", log_level=ERROR)
-    else:
-        ret_code = None
-        try:
-            response = requests.get(url)
-        except Exception as e:
-            logit(
-                logger, f"Failed to get a response from {url}, {e}",
-                refname="download_dwca", log_level=ERROR)
-        else:
-            try:
-                ret_code = response.status_code
-            except AttributeError:
-                logit(
-                    logger, f"Failed on URL {url}, no status_code",
-                    refname="download_dwca", log_level=ERROR)
-    if ret_code != 200:
+        return None
+    # Stream the archive to disk in blocks, rather than holding it all in memory
+    try:
+        with requests.get(url, stream=True, timeout=(10, 300)) as response:
+            response.raise_for_status()
+            with open(outfilename, "wb") as outf:
+                for chunk in response.iter_content(chunk_size=COPY_BUFFER_SIZE):
+                    outf.write(chunk)
+    except requests.HTTPError as e:
         logit(
-            logger, f"Failed on URL {url}, code {ret_code}",
+            logger, f"Failed on URL {url}, code {e.response.status_code}",
             refname="download_dwca", log_level=ERROR)
         return None
+    except Exception as e:
+        logit(
+            logger, f"Failed to download {url} to {outfilename}, {e}",
+            refname="download_dwca", log_level=ERROR)
+        # Do not leave a partial download
+        if os.path.exists(outfilename):
+            os.remove(outfilename)
+        return None
+    return outfilename
+
+
+# ......................................................
+def download_dwcas(datasets, baseoutpath, overwrite=False, max_workers=8, logger=None):
+    """Download DarwinCore Archive files for multiple datasets concurrently.
+
+    Args:
+        datasets: dictionary of dataset keys and metadata dictionaries containing the
+            "url" of each DWCA, as returned by get_dwca_urls.
+        baseoutpath: destination directory for DWCA files
+        overwrite: True if existing files should be replaced
+        max_workers: maximum number of simultaneous downloads.  If 1, download
+            sequentially.
+        logger: optional logger for saving output messages to file.
+
+    Returns:
+        datasets, with the downloaded "filename" (or None on failure) added to the
+            metadata of each dataset with a URL.
+
+    Note:
+        Downloads are network-bound, so threads overlap the waits on each response.
+
+    Note:
+        A failure for one dataset, such as an existing file that cannot be replaced,
+            is logged and does not stop the downloads of the others.
+    """
+    urls = {key: meta["url"] for key, meta in datasets.items() if "url" in meta}
+    if max_workers == 1:
+        for key, url in urls.items():
+            datasets[key]["filename"] = _try_download_dwca(
+                url, baseoutpath, overwrite, logger)
     else:
-        output = response.content
-        with open(outfilename, "wb") as outf:
-            outf.write(output)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _try_download_dwca, url, baseoutpath, overwrite, logger): key
+                for key, url in urls.items()}
+            for future in as_completed(futures):
+                datasets[futures[future]]["filename"] = future.result()
+    return datasets
+
+
+# ......................................................
+def _try_download_dwca(url, baseoutpath, overwrite, logger):
+    # Return the downloaded filename, or None after logging any failure
+    try:
+        outfilename = download_dwca(
+            url, baseoutpath, overwrite=overwrite, logger=logger)
+    except Exception as e:
+        logit(
+            logger, f"Failed to download {url}: {e}", refname="download_dwcas",
+            log_level=ERROR)
+        outfilename = None
     return outfilename
 
 
+# ......................................................
+def extract_dwcas(zip_filenames, max_workers=8, logger=None):
+    """Extract multiple zipped DarwinCore Archive files concurrently.
+
+    Args:
+        zip_filenames: list of full filenames of DWCA zipfiles, each extracted into
+            the directory containing it.
+        max_workers: maximum number of simultaneous extractions.  If 1, extract
+            sequentially.
+        logger: optional logger for saving output messages to file.
+
+    Returns:
+        dwcas: dictionary of zip filenames and the DwCArchive for each.
+
+    Raises:
+        Exception: on failure to extract any of the archives.  No dictionary is
+            returned, even for archives which were extracted.
+
+    Note:
+        Decompression and file writes release the GIL, so threads overlap them.
+    """
+    dwcas = {zfname: DwCArchive(zfname, logger=logger) for zfname in zip_filenames}
+    if max_workers == 1:
+        for dwca in dwcas.values():
+            dwca.extract_from_zip()
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(dwca.extract_from_zip) for dwca in dwcas.values()]
+            # Raise any exception from extraction
+            for future in as_completed(futures):
+                future.result()
+    return dwcas
+
+
+# ......................................................
+def _fix_char(ch):
+    # Empty values are None, escaped whitespace is replaced by the character
+    if not ch:
+        ch = None
+    else:
+        ch = ESCAPED_CHARS.get(ch, ch)
+    return ch
+
+
+# ......................................................
+@functools.lru_cache(maxsize=64)
+def _read_dataset_uuid(ds_meta_fname, mtime_ns, size):
+    # Cached by filename, modification time and size, so a changed file is re-read
+    idstr = None
+    # Stream the file, stopping at the first valid UUID in the dataset element,
+    #   rather than building the whole element tree
+    tags = []
+    for event, elt in ET.iterparse(ds_meta_fname, events=("start", "end")):
+        if event == "start":
+            tags.append(elt.tag)
+            continue
+        tags.pop()
+        # End of the top level dataset element
+        if len(tags) == 1 and elt.tag == "dataset":
+            break
+        # Identifier that is a direct child of the top level dataset element
+        elif tags[1:] == ["dataset"] and elt.tag == "alternateIdentifier":
+            idstr = elt.text
+            if is_valid_uuid(idstr):
+                break
+    return idstr
+
+
+# ......................................................
+@functools.lru_cache(maxsize=64)
+def _read_core_fileinfo(meta_fname, mtime_ns, size):
+    # Cached by filename, modification time and size, so a changed file is re-read
+    fileinfo = {}
+    # Stream the file, stopping when the core element is complete, and discard
+    #   extension elements, rather than building the whole element tree
+    core_elt = None
+    for _event, elt in ET.iterparse(meta_fname, events=("end",)):
+        if elt.tag == CORE_TAG:
+            core_elt = elt
+            break
+        elif elt.tag == EXTENSION_TAG:
+            elt.clear()
+    if core_elt is not None and core_elt.attrib["rowType"] == DWCA.CORE_TYPE:
+        # CSV file name
+        core_loc_elt = core_elt.find(CORE_LOCATION_PATH)
+        fileinfo[DWCA.LOCATION_KEY] = core_loc_elt.text
+        # CSV file structure
+        fileinfo[DWCA.DELIMITER_KEY] = _fix_char(
+            core_elt.attrib[DWCA.DELIMITER_KEY])
+        fileinfo[DWCA.LINE_DELIMITER_KEY] = _fix_char(
+            core_elt.attrib[DWCA.LINE_DELIMITER_KEY])
+        quote_char = _fix_char(
+            core_elt.attrib[DWCA.QUOTE_CHAR_KEY])
+        fileinfo[DWCA.QUOTE_CHAR_KEY] = quote_char
+        fileinfo[DWCA.HEADER_LINES_KEY] = int(
+            core_elt.attrib.get(DWCA.HEADER_LINES_KEY, 0))
+        # CSV file fields/indices
+        # UUID index, with default UUID fieldname
+        uuid_idx = int(core_elt.find(UUID_TAG).attrib["index"])
+        # Dictionaries of index --> fieldname and fieldname --> index
+        idx_to_term = {uuid_idx: DWCA.UUID_KEY}
+        term_to_idx = {}
+        # Rest of fields and indices, a field at uuid_idx replaces default name
+        for celt in core_elt.iterfind(FIELD_TAG):
+            # strip namespace url from term
+            term = celt.attrib["term"].rpartition("/")[2]
+            idx = int(celt.attrib["index"])
+            idx_to_term[idx] = term
+            term_to_idx[term] = idx
+        uuid_fldname = idx_to_term[uuid_idx]
+        term_to_idx.setdefault(uuid_fldname, uuid_idx)
+        fileinfo[DWCA.UUID_KEY] = uuid_fldname
+        fileinfo[DWCA.FLDMAP_KEY] = term_to_idx
+        fileinfo[DWCA.IDXMAP_KEY] = idx_to_term
+        # CSV file fieldnames ordered by column index
+        fileinfo[DWCA.FLDS_KEY] = [idx_to_term[i] for i in sorted(idx_to_term)]
+    return fileinfo
+
+
 # .............................................................................
 class DwCArchive:
     """Class to download and read a Darwin Core Archive."""
@@ -194,28 +380,14 @@ class DwCArchive:
 
     # ......................................................
     def _get_date(self, dwc_rec):
-        coll_date = ""
-        try:
-            yr = dwc_rec["year"]
-            int(yr)
-        except Exception:
-            pass
-        else:
-            coll_date = yr
-            try:
-                mo = dwc_rec["month"]
-                int(mo)
-            except Exception:
-                pass
-            else:
-                coll_date = "{}-{}".format(coll_date, mo)
-                try:
-                    dy = dwc_rec["day"]
-                    int(dy)
-                except Exception:
-                    pass
-                else:
-                    coll_date = "{}-{}".format(coll_date, dy)
+        # Join year, month, day, stopping at the first missing or non-integer value
+        date_parts = []
+        for key in DATE_KEYS:
+            val = str(dwc_rec.get(key, ""))
+            if not val.isdigit():
+                break
+            date_parts.append(val)
+        coll_date = "-".join(date_parts)
         return coll_date
 
     # ......................................................
@@ -225,20 +397,40 @@ class DwCArchive:
         Args:
             extract_path: destination directory for writing the zipfile contents.
         """
-        zfile = zipfile.ZipFile(self.zipfile, mode="r", allowZip64=True)
         if extract_path is None:
             extract_path, _ = os.path.split(self.zipfile)
+        valid_extensions = {".xml", ".csv", ".txt"}
+        real_extract_path = os.path.realpath(extract_path)
+        skipped = []
         # unzip zip file stream
-        for zinfo in zfile.infolist():
-            _, ext = os.path.splitext(zinfo.filename)
-            # Check file extension and only unzip valid files
-            if ext in [".xml", ".csv", ".txt"]:
-                zfile.extract(zinfo, path=extract_path)
-            else:
-                logit(
-                    self.logger,
-                    f"Unexpected filename {zinfo.filename} in zipfile {self.zipfile}",
-                    refname=self.__class__.__name__, log_level=ERROR)
+        with zipfile.ZipFile(self.zipfile, mode="r", allowZip64=True) as zfile:
+            for zinfo in zfile.infolist():
+                _, ext = os.path.splitext(zinfo.filename)
+                target = os.path.realpath(os.path.join(extract_path, zinfo.filename))
+                # Do not write outside of the extract path
+                if os.path.commonpath([real_extract_path, target]) != real_extract_path:
+                    logit(
+                        self.logger,
+                        f"Unsafe filename {zinfo.filename} in zipfile {self.zipfile}",
+                        refname=self.__class__.__name__, log_level=ERROR)
+                # Check file extension and only unzip valid files, streaming in large
+                #   blocks to reduce system calls on large data files
+                elif ext in valid_extensions:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with zfile.open(zinfo) as src, open(target, "wb") as dst:
+                        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                else:
+                    skipped.append(zinfo.filename)
+        # Report unexpected files once, listing only the first few
+        if skipped:
+            names = ", ".join(skipped[:MAX_LOGGED_NAMES])
+            if len(skipped) > MAX_LOGGED_NAMES:
+                names = f"{names}, ..."
+            logit(
+                self.logger,
+                f"Skipped {len(skipped)} unexpected files in zipfile {self.zipfile}: "
+                f"{names}",
+                refname=self.__class__.__name__, log_level=ERROR)
 
     # ......................................................
     def read_dataset_uuid(self):
@@ -247,34 +439,20 @@ class DwCArchive:
         Returns:
             idstr: the UUID for the current dataset.
         """
-        idstr = None
         if os.path.split(self.ds_meta_fname)[1] != DWCA.DATASET_META_FNAME:
             logit(
                 self.logger,
                 f"Expected filename {DWCA.DATASET_META_FNAME} at {self.ds_meta_fname}",
                 refname=self.__class__.__name__, log_level=ERROR)
             return ""
-        tree = ET.parse(self.ds_meta_fname)
-        root = tree.getroot()
-        elt = root.find("dataset")
-        id_elts = elt.findall("alternateIdentifier")
-        for ie in id_elts:
-            idstr = ie.text
-            if is_valid_uuid(idstr):
-                break
+        # Parse the file only if it is new or has changed since last parsed
+        stat = os.stat(self.ds_meta_fname)
+        idstr = _read_dataset_uuid(self.ds_meta_fname, stat.st_mtime_ns, stat.st_size)
         return idstr
 
     # ......................................................
     def _fix_char(self, ch):
-        if not ch:
-            ch = None
-        elif ch == "\\t":
-            ch = "\t"
-        elif ch == "\\n":
-            ch = "\n"
-        elif ch == "":
-            ch = None
-        return ch
+        return _fix_char(ch)
 
     # ......................................................
     def read_core_fileinfo(self):
@@ -285,9 +463,11 @@ class DwCArchive:
                 names/tags in the meta.xml file:
                     location (for filename), id (for fieldname of record UUID)
                     fieldsTerminatedBy, linesTerminatedBy, fieldsEnclosedBy,
+                    ignoreHeaderLines,
                 plus:
                     fieldnames: ordered fieldnames
                     fieldname_index_map: dict of fields and corresponding column indices
+                    index_fieldname_map: dict of column indices and corresponding fields
         """
         if os.path.split(self.meta_fname)[1] != DWCA.META_FNAME:
             logit(
@@ -297,64 +477,66 @@ class DwCArchive:
             )
             return ""
 
-        fileinfo = {}
-        field_idxs = {}
-        tree = ET.parse(self.meta_fname)
-        root = tree.getroot()
-        core_elt = root.find("{}core".format(DWCA.NS))
-        if core_elt.attrib["rowType"] == DWCA.CORE_TYPE:
-            # CSV file name
-            core_files_elt = core_elt.find("{}files".format(DWCA.NS))
-            core_loc_elt = core_files_elt.find("{}{}".format(DWCA.NS, DWCA.LOCATION_KEY))
-            fileinfo[DWCA.LOCATION_KEY] = core_loc_elt.text
-            # CSV file structure
-            fileinfo[DWCA.DELIMITER_KEY] = self._fix_char(
-                core_elt.attrib[DWCA.DELIMITER_KEY])
-            fileinfo[DWCA.LINE_DELIMITER_KEY] = self._fix_char(
-                core_elt.attrib[DWCA.LINE_DELIMITER_KEY])
-            quote_char = self._fix_char(
-                core_elt.attrib[DWCA.QUOTE_CHAR_KEY])
-            fileinfo[DWCA.QUOTE_CHAR_KEY] = quote_char
-            # CSV file fields/indices
-            # Dictionary of field --> index, index --> field
-            # UUID key and index
-            uuid_idx = core_elt.find("{}{}".format(
-                DWCA.NS, DWCA.UUID_KEY)).attrib["index"]
-            # The uuid_idx index --> fieldname
-            #     plus fieldname --> uuid_idx
-            field_idxs[DWCA.UUID_KEY] = uuid_idx
-            field_idxs[uuid_idx] = DWCA.UUID_KEY
-            all_idxs = {int(uuid_idx)}
-            # Rest of fields and indices
-            field_elts = core_elt.findall("{}field".format(DWCA.NS))
-            startidx = len(DWCA.NS)-1
-            # Default UUID fieldname
-            uuid_fldname = DWCA.UUID_KEY
-            for celt in field_elts:
-                tmp = celt.attrib["term"]
-                # strip namespace url from term
-                startidx = tmp.rfind("/") + 1
-                term = tmp[startidx:]
-                idx = celt.attrib["index"]
-                # Correct UUID fieldname
-                if idx == uuid_idx:
-                    uuid_fldname = term
-                    field_idxs.pop(DWCA.UUID_KEY)
-                all_idxs.add(int(idx))
-                field_idxs[idx] = term
-                field_idxs[term] = idx
-            fileinfo[DWCA.UUID_KEY] = uuid_fldname
-            fileinfo[DWCA.FLDMAP_KEY] = field_idxs
-            # CSV file fieldnames ordered by column index
-            all_idxs = list(all_idxs)
-            all_idxs.sort()
-            ordered_fldnames = []
-            for i in all_idxs:
-                ordered_fldnames.append(field_idxs[str(i)])
-            fileinfo[DWCA.FLDS_KEY] = ordered_fldnames
-
+        # Parse the file only if it is new or has changed since last parsed, and
+        #   return a copy that callers may modify
+        stat = os.stat(self.meta_fname)
+        fileinfo = copy.deepcopy(
+            _read_core_fileinfo(self.meta_fname, stat.st_mtime_ns, stat.st_size))
         return fileinfo
 
+    # ......................................................
+    def iter_core_chunks(self, fileinfo=None, fieldnames=None, chunksize=100000):
+        """Read the core occurrence file in chunks of records.
+
+        Args:
+            fileinfo (dict): core occurrence file information from
+                read_core_fileinfo.  If None, it is read from meta.xml.
+            fieldnames (list): fieldnames of the columns to read.  If None, all
+                fields defined in meta.xml are read.
+            chunksize (int): maximum number of records in each chunk.
+
+        Yields:
+            chunk (pandas.DataFrame): records, with string values and columns named by
+                fieldnames, in file order.
+
+        Note:
+            Only the requested columns are parsed, by the pandas C tokenizer, rather
+                than splitting every field of every line in Python.  Empty values are
+                returned as empty strings.  Records with fewer values than meta.xml
+                fields are padded with empty strings, and values past the last field
+                are ignored, unlike fileop.get_csv_batch_reader, which skips them.
+
+        Note:
+            pandas is imported on first use, so that importing this module for
+                downloading or reading metadata does not load it.
+        """
+        # pandas dominates the import time of this module, and is only needed here
+        import pandas as pd
+
+        if fileinfo is None:
+            fileinfo = self.read_core_fileinfo()
+        field_idxs = fileinfo[DWCA.FLDMAP_KEY]
+        if fieldnames is None:
+            fieldnames = fileinfo[DWCA.FLDS_KEY]
+        # pandas returns usecols in file order, so name them in that order
+        idx_fields = sorted((field_idxs[fld], fld) for fld in fieldnames)
+        col_names = [fld for _idx, fld in idx_fields]
+        core_fname = os.path.join(self.dwca_path, fileinfo[DWCA.LOCATION_KEY])
+        quote_char = fileinfo[DWCA.QUOTE_CHAR_KEY]
+        if quote_char is None:
+            quote_args = {"quoting": csv.QUOTE_NONE}
+        else:
+            quote_args = {"quotechar": quote_char}
+        reader = pd.read_csv(
+            core_fname, sep=fileinfo[DWCA.DELIMITER_KEY], header=None,
+            skiprows=fileinfo[DWCA.HEADER_LINES_KEY],
+            usecols=[idx for idx, _fld in idx_fields], dtype=str, na_filter=False,
+            engine="c", chunksize=chunksize, **quote_args)
+        with reader:
+            for chunk in reader:
+                chunk.columns = col_names
+                yield chunk
+
 
 # # ...............................................
 # def index_specify7_dataset(
@@ -1,15 +1,26 @@
 """Miscellaneous tools for reading and writing CSV files."""
 import csv
-import glob
+import functools
+import mmap
+import operator
 import os
-import subprocess
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 from sys import maxsize
+import warnings
 
+COUNT_BLOCK_SIZE = 1 << 20
 EXTRA_VALS_KEY = "rest"
+HEADER_BLOCK_SIZE = 1 << 16
 SHP_EXT = "shp"
 SHP_EXTENSIONS = [
     ".shp", ".shx", ".dbf", ".prj", ".sbn", ".sbx", ".fbn", ".fbx", ".ain",
-    ".aih", ".ixs", ".mxs", ".atx", ".shp.xml", ".cpg", ".qix"],
+    ".aih", ".ixs", ".mxs", ".atx", ".shp.xml", ".cpg", ".qix"]
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Allow fields of any size, set once for all CSV readers and writers
+csv.field_size_limit(maxsize)
 
 
 # .............................................................................
@@ -21,32 +32,54 @@ def get_line_count(filename):
 
     Returns:
         number of lines in the file.
+
+    Note:
+        The file is memory-mapped and newlines are counted one block at a time,
+            rather than starting a `wc` subprocess.  A final line without a trailing
+            newline is also counted.
     """
-    cmd = f"wc -l {filename}"
-    info, _ = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE).communicate()
-    temp = info.split(b"\n")[0]
-    line_count = int(temp.split()[0])
+    line_count = 0
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start in range(0, len(mm), COUNT_BLOCK_SIZE):
+                    line_count += mm[start:start + COUNT_BLOCK_SIZE].count(b"\n")
+                if mm[-1:] != b"\n":
+                    line_count += 1
     return line_count
 
 
 # .............................................................................
-def get_header(filename):
+def get_header(filename, encoding="utf-8"):
     """Get fieldnames from the first line of a CSV file.
 
     Args:
         filename: file to read the header from
+        encoding: file encoding for input
 
     Returns:
         header: header line of a file.
+
+    Note:
+        The file is read in blocks with os.pread until the first newline, without
+            creating a buffered text file object.
     """
     header = None
     try:
-        f = open(filename, "r", encoding="utf-8")
-        header = f.readline()
+        fd = os.open(filename, os.O_RDONLY)
+        try:
+            buf = b""
+            while b"\n" not in buf:
+                block = os.pread(fd, HEADER_BLOCK_SIZE, len(buf))
+                if not block:
+                    break
+                buf += block
+        finally:
+            os.close(fd)
+        line, newline, _rest = buf.partition(b"\n")
+        header = (line.removesuffix(b"\r") + newline).decode(encoding)
     except Exception as e:
         print(f"Failed to read first line of {filename}: {e}")
-    finally:
-        f.close()
     return header
 
 
@@ -65,6 +98,11 @@ def get_csv_reader(datafile, delimiter, encoding):
 
     Raises:
         Exception: on failure to read or open the datafile.
+
+    Note:
+        For bulk reads of large files, get_csv_batch_reader or get_arrow_csv_reader
+            parse records natively, in batches, rather than one python object per
+            record.
     """
     try:
         f = open(datafile, "r", encoding=encoding)
@@ -98,9 +136,9 @@ def get_csv_writer(datafile, delimiter, encoding, fmode="w"):
     if fmode not in ("w", "a"):
         raise Exception("File mode must be 'w' (write) or 'a' (append)")
 
-    csv.field_size_limit(maxsize)
     try:
-        f = open(datafile, fmode, encoding=encoding)
+        f = open(
+            datafile, fmode, encoding=encoding, buffering=WRITE_BUFFER_SIZE)
         writer = csv.writer(
             f, escapechar="\\", delimiter=delimiter, quoting=csv.QUOTE_NONE)
     except Exception as e:
@@ -128,6 +166,11 @@ def get_csv_dict_reader(
 
     Raises:
         Exception: on failure to read or open the datafile.
+
+    Note:
+        For bulk reads of large files, get_csv_batch_reader or get_arrow_csv_reader
+            parse records natively, in batches, rather than one python object per
+            record.
     """
     try:
         f = open(datafile, "r", encoding=encoding)
@@ -151,6 +194,130 @@ def get_csv_dict_reader(
     return dreader, f
 
 
+# .............................................................................
+def get_csv_batch_reader(
+        datafile, delimiter, encoding, fieldnames=None, chunksize=100000):
+    """Get a reader returning batches of CSV records as pandas DataFrames.
+
+    Args:
+        datafile: filename for CSV input.
+        delimiter: field separator for input
+        encoding: file encoding for input
+        fieldnames: fieldnames for input records, if None, read from the first line
+        chunksize: maximum number of records in each batch
+
+    Returns:
+        reader: an iterator of pandas.DataFrame objects, each with up to chunksize
+            records, and all values as strings.
+        f: an open file object.
+
+    Raises:
+        Exception: on failure to read or open the datafile.
+
+    Note:
+        Records are parsed natively by get_arrow_csv_reader, one block at a time,
+            and each block is converted to DataFrames, instead of creating a python
+            object per record.  Use this in place of get_csv_dict_reader for bulk
+            processing of columns.
+
+    Note:
+        Quotes are not interpreted, as with get_csv_dict_reader(ignore_quotes=True).
+            Records with more or fewer values than fieldnames are skipped, each with
+            a pandas.errors.ParserWarning, as in get_arrow_csv_reader.  The pandas C
+            parser is not used, as it pads short records with empty values, which
+            cannot be told apart from empty trailing values.
+    """
+    try:
+        arrow_reader, f = get_arrow_csv_reader(
+            datafile, delimiter, encoding, fieldnames=fieldnames)
+    except Exception:
+        raise
+    reader = _iter_dataframes(arrow_reader, chunksize)
+    return reader, f
+
+
+# .............................................................................
+def _iter_dataframes(arrow_reader, chunksize):
+    # Yield DataFrames of up to chunksize records from each RecordBatch, indexed by
+    #   record position in the file, as pandas numbers chunks
+    offset = 0
+    for batch in arrow_reader:
+        for start in range(0, batch.num_rows, chunksize):
+            chunk = batch.slice(start, chunksize).to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+
+# .............................................................................
+def get_arrow_csv_reader(
+        datafile, delimiter, encoding, fieldnames=None, block_size=8 << 20):
+    """Get a streaming reader returning batches of CSV records as Arrow RecordBatches.
+
+    Args:
+        datafile: filename for CSV input.
+        delimiter: field separator for input
+        encoding: file encoding for input
+        fieldnames: fieldnames for input records, if None, read from the first line
+        block_size: number of bytes parsed into each batch
+
+    Returns:
+        reader: a pyarrow.csv.CSVStreamingReader of pyarrow.RecordBatch objects,
+            with all values as strings.
+        f: an open file object.
+
+    Raises:
+        Exception: on failure to read or open the datafile.
+
+    Note:
+        Blocks are parsed in C++, on multiple threads, into columnar buffers.
+            Consumers needing DictReader-shaped records can iterate over
+            `batch.to_pylist()` for each batch, which converts a whole block of
+            records at once.
+
+    Note:
+        Quotes are not interpreted, as with get_csv_dict_reader(ignore_quotes=True).
+            Records with more or fewer values than fieldnames are skipped, each with
+            a pandas.errors.ParserWarning, rather than collected under
+            EXTRA_VALS_KEY or padded with empty values.
+    """
+    f = None
+    try:
+        f = open(datafile, "rb")
+        if fieldnames is None:
+            header = f.readline().decode(encoding)
+            tmpflds = header.split(delimiter)
+            fieldnames = [fld.strip() for fld in tmpflds]
+        read_opts = pacsv.ReadOptions(
+            column_names=fieldnames, encoding=encoding, block_size=block_size)
+        parse_opts = pacsv.ParseOptions(
+            delimiter=delimiter, quote_char=False, escape_char="\\",
+            invalid_row_handler=_skip_invalid_row)
+        convert_opts = pacsv.ConvertOptions(
+            column_types={fld: pa.string() for fld in fieldnames},
+            strings_can_be_null=False)
+        reader = pacsv.open_csv(
+            f, read_options=read_opts, parse_options=parse_opts,
+            convert_options=convert_opts)
+    except Exception as e:
+        if f is not None:
+            f.close()
+        raise Exception(f"Failed to read or open {datafile}, ({e})")
+    else:
+        print(f"Opened file {datafile} for arrow read")
+    return reader, f
+
+
+# .............................................................................
+def _skip_invalid_row(row):
+    # Warn about and skip a record with the wrong number of values, instead of
+    #   failing, with the same warning category pandas uses for bad lines
+    warnings.warn(
+        f"Skipping record {row.number}: expected {row.expected_columns} fields, "
+        f"saw {row.actual_columns}", pd.errors.ParserWarning)
+    return "skip"
+
+
 # .............................................................................
 def get_csv_dict_writer(datafile, delimiter, encoding, fieldnames, fmode="w"):
     """Get a CSV writer that can handle encoding.
@@ -173,9 +340,9 @@ def get_csv_dict_writer(datafile, delimiter, encoding, fieldnames, fmode="w"):
     if fmode not in ("w", "a"):
         raise Exception("File mode must be 'w' (write) or 'a' (append)")
 
-    csv.field_size_limit(maxsize)
     try:
-        f = open(datafile, fmode, encoding=encoding)
+        f = open(
+            datafile, fmode, encoding=encoding, buffering=WRITE_BUFFER_SIZE)
         writer = csv.DictWriter(
             f, fieldnames=fieldnames, delimiter=delimiter, escapechar="\\",
             quoting=csv.QUOTE_NONE)
@@ -186,6 +353,50 @@ def get_csv_dict_writer(datafile, delimiter, encoding, fieldnames, fmode="w"):
     return writer, f
 
 
+# ...............................................
+def make_row_builder(outfields):
+    """Create a function to build rows for CSV output from records.
+
+    Args:
+        outfields: fieldnames for output
+
+    Returns:
+        a function taking a dictionary record of fieldnames and values, and returning
+            a row formatted for writing to a CSV output file.
+
+    Note:
+        Create the builder once, outside of a loop over records, so that the field
+            lookup is prepared once instead of for each record.
+    """
+    fields = tuple(outfields)
+    if len(fields) == 1:
+        fld = fields[0]
+
+        def getter(rec):
+            return (rec[fld], )
+    elif fields:
+        getter = operator.itemgetter(*fields)
+    else:
+        def getter(rec):
+            return ()
+
+    def build_row(rec):
+        try:
+            vals = getter(rec)
+        # Add output fields not present in record
+        except KeyError:
+            vals = [rec.get(fld) for fld in fields]
+        row = [
+            "" if val is None or val == "None"
+            else val.strip("\"") if isinstance(val, str) and val.startswith("\"")
+            else val
+            for val in vals
+        ]
+        return row
+
+    return build_row
+
+
 # ...............................................
 def makerow(rec, outfields):
     """Create a row for CSV output.
@@ -196,53 +407,100 @@ def makerow(rec, outfields):
 
     Returns:
         a row formatted as a string for writing to a CSV output file.
+
+    Note:
+        Row builders are cached for the most recently used field lists, since a
+            pipeline usually writes all records with the same outfields.
     """
-    row = []
-    for fld in outfields:
-        try:
-            val = rec[fld]
-            if val in (None, "None"):
-                row.append("")
-            else:
-                if isinstance(val, str) and val.startswith("\""):
-                    val = val.strip("\"")
-                row.append(val)
-        # Add output fields not present in record
-        except Exception:
-            row.append("")
+    row = _get_row_builder(tuple(outfields))(rec)
     return row
 
 
 # ...............................................
-def getLine(csvreader, recno):
-    """Return a line while keeping track of the line number and errors.
+@functools.lru_cache(maxsize=32)
+def _get_row_builder(outfields):
+    return make_row_builder(outfields)
+
+
+# ...............................................
+def intern_rows(dreader, intern_cols):
+    """Yield records sharing a single string object for each repeated value.
+
+    Args:
+        dreader: a csv.DictReader, or other iterator of dictionary records
+        intern_cols: fieldnames of low-cardinality columns, such as kingdom or
+            basisOfRecord, whose values repeat across many records.
+
+    Yields:
+        rec: dictionary record of fieldnames and values, with the values of
+            intern_cols replaced by the first equal string read.
+
+    Note:
+        Each column has its own cache of values, which lasts only for this iteration,
+            so create a new generator for each file to keep memory bounded.
+    """
+    caches = {col: {} for col in intern_cols}
+    for rec in dreader:
+        for col, cache in caches.items():
+            val = rec.get(col)
+            if val is not None:
+                rec[col] = cache.setdefault(val, val)
+        yield rec
+
+
+# ...............................................
+def iter_lines(csvreader, start_recno=0):
+    """Yield lines while keeping track of the line number and errors.
 
     Args:
         csvreader: a csv.reader object opened with a file
-        recno: the current record number
+        start_recno: the record number before the first line to read
 
-    Returns:
-        line: current line number of the csvfile.
+    Yields:
+        line: current line of the csvfile.
         recno: current record number of the csvfile.
+
+    Note:
+        Lines are read in a plain loop; bad records are reported and skipped, then
+            reading resumes with the next line.
     """
-    success = False
-    line = None
-    while not success and csvreader is not None:
+    recno = start_recno
+    while True:
         try:
-            line = next(csvreader)
-            if line:
-                recno += 1
-            success = True
+            for line in csvreader:
+                if line:
+                    recno += 1
+                yield line, recno
         except OverflowError as e:
             recno += 1
             print(f"Overflow on record {recno}, line {csvreader.line_num} ({e})")
-        except StopIteration:
-            print(f"EOF after record {recno}, line {csvreader.line_num}")
-            success = True
         except Exception as e:
             recno += 1
             print(f"Bad record on record {recno}, line {csvreader.line_num} ({e})")
+        else:
+            print(f"EOF after record {recno}, line {csvreader.line_num}")
+            return
+
 
+# ...............................................
+def getLine(csvreader, recno):
+    """Return a line while keeping track of the line number and errors.
+
+    Args:
+        csvreader: a csv.reader object opened with a file
+        recno: the current record number
+
+    Returns:
+        line: current line number of the csvfile.
+        recno: current record number of the csvfile.
+
+    Note:
+        To read all lines of a file, loop over iter_lines instead.
+    """
+    line = None
+    if csvreader is not None:
+        for line, recno in iter_lines(csvreader, start_recno=recno):
+            break
     return line, recno
 
 
@@ -308,16 +566,18 @@ def delete_file(file_name, delete_dir=False):
         pth, _ = os.path.split(file_name)
         if file_name is not None and os.path.exists(file_name):
             base, ext = os.path.splitext(file_name)
-            if ext == SHP_EXT:
-                similar_file_names = glob.glob(base + '.*')
+            if ext == f".{SHP_EXT}":
+                # Find related files by name in one pass over the directory entries
+                stem = os.path.basename(base)
                 try:
-                    for sim_file_name in similar_file_names:
-                        _, sim_ext = os.path.splitext(sim_file_name)
-                        if sim_ext in SHP_EXTENSIONS:
-                            os.remove(sim_file_name)
+                    with os.scandir(pth or os.curdir) as entries:
+                        for entry in entries:
+                            if (entry.name.startswith(stem)
+                                    and entry.name[len(stem):] in SHP_EXTENSIONS):
+                                os.remove(entry.path)
                 except Exception as e:
                     success = False
-                    msg = f"Failed to remove {sim_file_name}, {e}"
+                    msg = f"Failed to remove shapefile {file_name}, {e}"
             else:
                 try:
                     os.remove(file_name)
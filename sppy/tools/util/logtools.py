@@ -1,10 +1,12 @@
 """Standard logger for console and/or file logging."""
-from io import StringIO
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
-from pprint import pp
+from pprint import pformat
+import queue
 import sys
+import threading
 
 # Rough log of processing progress
 LOGINTERVAL = 1000000
@@ -16,7 +18,14 @@ LOGFILE_BACKUP_COUNT = 5
 
 # .....................................................................................
 class Logger:
-    """Class containing a logger for consistent logging."""
+    """Class containing a logger for consistent logging.
+
+    Note:
+        Messages are written to the file and console by a background thread, so they
+            may appear after output printed later, and the log file may not yet
+            contain the most recent messages.  Call flush before reading or
+            uploading the log file, and close when finished with the logger.
+    """
 
     # .......................
     def __init__(
@@ -52,13 +61,52 @@ class Logger:
         # Get logger
         self.logger = logging.getLogger(self.log_name)
         self.logger.setLevel(logging.DEBUG)
-        # Add handlers to logger
         formatter = logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT)
         for handler in handlers:
             handler.setLevel(self.log_level)
             handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+        # Handlers write records from a queue in a background thread, so logging
+        #   calls only enqueue a record instead of waiting on file or console output
+        self._queue = queue.SimpleQueue()
+        self._handlers = handlers
+        # Serialize flush and close, which stop and restart or drop the listener
+        self._lock = threading.Lock()
+        self._listener = QueueListener(
+            self._queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        self._queue_handler = QueueHandler(self._queue)
+        self.logger.addHandler(self._queue_handler)
         self.logger.propagate = False
+        # Write any queued records before the interpreter exits
+        atexit.register(self.close)
+
+    # ........................
+    def flush(self):
+        """Write all queued messages to the file and console before returning."""
+        with self._lock:
+            if self._listener is not None:
+                # Stopping the listener processes every queued record
+                self._listener.stop()
+                for handler in self._handlers:
+                    handler.flush()
+                self._listener.start()
+
+    # ........................
+    def close(self):
+        """Write all queued messages, then stop the background logging thread.
+
+        Note:
+            Messages logged after close are no longer written to this logger's file
+                or console handlers.  Calling close again does nothing.
+        """
+        with self._lock:
+            if self._listener is not None:
+                self.logger.removeHandler(self._queue_handler)
+                self._listener.stop()
+                self._listener = None
+                for handler in self._handlers:
+                    handler.close()
+                atexit.unregister(self.close)
 
     # ........................
     def log(self, msg, refname="", log_level=logging.INFO):
@@ -83,9 +131,7 @@ def prettify_object(print_obj):
     Returns:
         formatted string representation of object
     """
-    strm = StringIO()
-    pp(print_obj, stream=strm)
-    obj_str = strm.getvalue()
+    obj_str = pformat(print_obj, sort_dicts=False)
     return obj_str
 
 
@@ -1,9 +1,15 @@
 """Random tools used frequently in Specify Network."""
-from io import StringIO
-from pprint import pp
+import functools
+import numpy as np
+from pprint import pformat
+import re
 import sys
 import traceback
-from uuid import UUID
+
+# Keys of an errinfo dictionary, in output order
+_ERRINFO_KEYS = ("error", "warning", "info")
+_UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z")
 
 
 # ......................................................
@@ -22,12 +28,77 @@ def is_valid_uuid(uuid_to_test, version=4):
         True
         >>> is_valid_uuid("c9bf9e58")
         False
+
+    Note:
+        A valid UUID is in canonical (lowercase, hyphenated) form, with the requested
+            version and the RFC 4122 variant.  Checking this with a precompiled regex
+            is equivalent to comparing the string to `str(UUID(uuid_to_test,
+            version=version))`, without parsing and rebuilding it.
+
+    Note:
+        Results for strings are cached in a bounded, per-process LRU cache, as the
+            same identifiers are validated repeatedly when processing records.
     """
-    try:
-        uuid_obj = UUID(uuid_to_test, version=version)
-    except ValueError:
+    # Reject non-strings before the cache, which requires hashable arguments
+    if not isinstance(uuid_to_test, str):
         return False
-    return str(uuid_obj) == uuid_to_test
+    is_valid = _is_valid_uuid_str(uuid_to_test, version)
+    return is_valid
+
+
+# ......................................................
+@functools.lru_cache(maxsize=4096)
+def _is_valid_uuid_str(uuid_to_test, version):
+    if _UUID_PATTERN.match(uuid_to_test) is None:
+        return False
+    is_valid = (
+        version in (1, 2, 3, 4, 5)
+        and uuid_to_test[14] == str(version)
+        and uuid_to_test[19] in "89ab")
+    return is_valid
+
+
+# ......................................................
+def get_valid_uuid_mask(uuids_to_test, version=4):
+    """Check if each of many values is a valid UUID.
+
+    Args:
+        uuids_to_test (pandas.Series or iterable): values to test.
+        version : {1, 2, 3, 4}
+
+    Returns:
+        valid_mask (pandas.Series or numpy.ndarray): boolean Series with the index of
+            uuids_to_test, if it is a pandas.Series, otherwise a boolean array in the
+            order of uuids_to_test, `True` for each valid UUID, with the same result
+            as is_valid_uuid.
+
+    Note:
+        For a pandas Series of strings, all values are matched by pandas in one
+            vectorized call, with a regex that also checks the version and variant,
+            instead of one Python call per value.  A Series without string values,
+            such as a numeric one, contains no valid UUIDs.
+    """
+    if hasattr(uuids_to_test, "index") and hasattr(uuids_to_test, "map"):
+        try:
+            str_values = uuids_to_test.str
+        except AttributeError:
+            # Values are not strings, so none are valid
+            valid_mask = uuids_to_test.map(lambda _val: False).astype(bool)
+        else:
+            if version in (1, 2, 3, 4, 5):
+                version_pattern = str(version)
+            else:
+                # Empty lookahead which never matches, invalid version
+                version_pattern = "(?!)"
+            pattern = (
+                f"[0-9a-f]{{8}}-[0-9a-f]{{4}}-{version_pattern}[0-9a-f]{{3}}-"
+                f"[89ab][0-9a-f]{{3}}-[0-9a-f]{{12}}")
+            valid_mask = str_values.fullmatch(pattern, na=False).astype(bool)
+    else:
+        valid_mask = np.fromiter(
+            (is_valid_uuid(val, version=version) for val in uuids_to_test),
+            dtype=bool)
+    return valid_mask
 
 
 # ..........................
@@ -37,15 +108,9 @@ def get_traceback():
     Returns:
         trcbk: traceback of steps executed before an exception
     """
-    exc_type, exc_val, this_traceback = sys.exc_info()
-    tb = traceback.format_exception(exc_type, exc_val, this_traceback)
-    tblines = []
-    cr = "\n"
-    for line in tb:
-        line = line.rstrip(cr)
-        parts = line.split(cr)
-        tblines.extend(parts)
-    trcbk = cr.join(tblines)
+    _exc_type, exc_val, this_traceback = sys.exc_info()
+    tb = traceback.TracebackException(type(exc_val), exc_val, this_traceback)
+    trcbk = "".join(tb.format()).rstrip("\n")
     return trcbk
 
 
@@ -61,18 +126,9 @@ def combine_errinfo(errinfo1, errinfo2):
         dictionary of errors
     """
     errinfo = {}
-    for key in ("error", "warning", "info"):
-        try:
-            lst = errinfo1[key]
-        except KeyError:
-            lst = []
-        try:
-            lst2 = errinfo2[key]
-        except KeyError:
-            lst2 = []
-
-        if lst or lst2:
-            lst.extend(lst2)
+    for key in _ERRINFO_KEYS:
+        lst = errinfo1.get(key, []) + errinfo2.get(key, [])
+        if lst:
             errinfo[key] = lst
     return errinfo
 
@@ -91,13 +147,10 @@ def add_errinfo(errinfo, key, val_lst):
     """
     if errinfo is None:
         errinfo = {}
-    if key in ("error", "warning", "info"):
+    if key in _ERRINFO_KEYS:
         if isinstance(val_lst, str):
             val_lst = [val_lst]
-        try:
-            errinfo[key].extend(val_lst)
-        except KeyError:
-            errinfo[key] = val_lst
+        errinfo.setdefault(key, []).extend(val_lst)
     return errinfo
 
 
@@ -114,7 +167,5 @@ def prettify_object(print_obj):
     Note: this splits a string containing spaces in a list to multiple strings in the
         list.
     """
-    strm = StringIO()
-    pp(print_obj, stream=strm)
-    obj_str = strm.getvalue()
+    obj_str = pformat(print_obj, sort_dicts=False)
     return obj_str
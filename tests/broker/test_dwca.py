@@ -1,10 +1,13 @@
 """Functions to test the sppy.tools.util.dwca.DwCArchive with known URLs."""
 import os
+import pytest
+import requests
 import shutil
 import time
 
 from sppy.tools.util.dwca import (
-    assemble_download_filename, DwCArchive, get_dwca_urls, download_dwca)
+    assemble_download_filename, DwCArchive, get_dwca_urls, download_dwca,
+    download_dwcas)
 from sppy.tools.util.utils import is_valid_uuid
 from flask_app.broker.constants import (DWCA, TST_VALUES)
 
@@ -12,6 +15,24 @@ today = time.localtime()
 DATE_STR = f"{today.tm_year}.{today.tm_mon}.{today.tm_mday}"
 TEST_PATH = f"/tmp/test.{DATE_STR}"
 
+META_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<archive xmlns="http://rs.tdwg.org/dwc/text/" metadata="eml.xml">
+  <core encoding="UTF-8" fieldsTerminatedBy="\\t" linesTerminatedBy="\\n"
+      fieldsEnclosedBy="" ignoreHeaderLines="1"
+      rowType="http://rs.tdwg.org/dwc/terms/Occurrence">
+    <files><location>occurrence.txt</location></files>
+    <id index="0" />
+{fields}
+  </core>
+  <extension rowType="http://rs.gbif.org/terms/1.0/Multimedia">
+    <files><location>multimedia.txt</location></files>
+    <coreid index="0" />
+  </extension>
+</archive>
+"""
+BASE_URL = "https://example.org/dwca"
+FIELD_TEMPLATE = '    <field index="{idx}" term="http://rs.tdwg.org/dwc/terms/{term}"/>'
+
 
 # ...............................................
 def prep_dwca_data(do_download=False, do_extract=False):
@@ -94,13 +115,159 @@ def test_read_dwca_meta():
     fileinfo = archive.read_core_fileinfo()
     for key in (
             DWCA.DELIMITER_KEY, DWCA.LINE_DELIMITER_KEY, DWCA.QUOTE_CHAR_KEY,
-            DWCA.LOCATION_KEY, DWCA.UUID_KEY, DWCA.FLDMAP_KEY, DWCA.FLDS_KEY
+            DWCA.LOCATION_KEY, DWCA.UUID_KEY, DWCA.FLDMAP_KEY, DWCA.IDXMAP_KEY,
+            DWCA.FLDS_KEY
     ):
         # Key exists and is not empty
         assert(key in fileinfo.keys())
         assert(fileinfo[key])
 
 
+# ...............................................
+def _write_meta(dwca_path, terms, start_idx=0):
+    # Write a small meta.xml with the given terms at consecutive column indices
+    fields = "\n".join(
+        FIELD_TEMPLATE.format(idx=idx, term=term)
+        for idx, term in enumerate(terms, start=start_idx))
+    os.makedirs(dwca_path, exist_ok=True)
+    with open(os.path.join(dwca_path, DWCA.META_FNAME), "w") as f:
+        f.write(META_TEMPLATE.format(fields=fields))
+
+
+# ............................
+def test_read_core_fileinfo_maps(tmp_path):
+    """Read fieldname to index and index to fieldname maps from meta.xml."""
+    terms = ["occurrenceID", "institutionCode", "year"]
+    _write_meta(str(tmp_path), terms)
+    fileinfo = DwCArchive(str(tmp_path)).read_core_fileinfo()
+
+    assert(fileinfo[DWCA.LOCATION_KEY] == "occurrence.txt")
+    assert(fileinfo[DWCA.DELIMITER_KEY] == "\t")
+    assert(fileinfo[DWCA.HEADER_LINES_KEY] == 1)
+    # A field at the id index names the record UUID
+    assert(fileinfo[DWCA.UUID_KEY] == "occurrenceID")
+    assert(
+        fileinfo[DWCA.FLDMAP_KEY] ==
+        {"occurrenceID": 0, "institutionCode": 1, "year": 2})
+    assert(
+        fileinfo[DWCA.IDXMAP_KEY] ==
+        {0: "occurrenceID", 1: "institutionCode", 2: "year"})
+    assert(fileinfo[DWCA.FLDS_KEY] == terms)
+
+
+# ............................
+def test_read_core_fileinfo_default_uuid(tmp_path):
+    """Name the record UUID with the default fieldname if no field is at its index."""
+    _write_meta(str(tmp_path), ["institutionCode", "year"], start_idx=1)
+    fileinfo = DwCArchive(str(tmp_path)).read_core_fileinfo()
+
+    assert(fileinfo[DWCA.UUID_KEY] == DWCA.UUID_KEY)
+    assert(
+        fileinfo[DWCA.FLDMAP_KEY] ==
+        {DWCA.UUID_KEY: 0, "institutionCode": 1, "year": 2})
+    assert(
+        fileinfo[DWCA.IDXMAP_KEY] ==
+        {0: DWCA.UUID_KEY, 1: "institutionCode", 2: "year"})
+    assert(fileinfo[DWCA.FLDS_KEY] == [DWCA.UUID_KEY, "institutionCode", "year"])
+
+
+# ...............................................
+def _write_occurrences(dwca_path, lines):
+    # Write a small tab-delimited core occurrence file
+    with open(os.path.join(dwca_path, "occurrence.txt"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ............................
+def test_iter_core_chunks(tmp_path):
+    """Read requested core fields in chunks, in file column order."""
+    _write_meta(str(tmp_path), ["occurrenceID", "institutionCode", "year"])
+    _write_occurrences(str(tmp_path), [
+        "occurrenceID\tinstitutionCode\tyear",
+        "a1\tKU\t2001", "a2\t\t1999", "a3\tUF\t"])
+    archive = DwCArchive(str(tmp_path))
+
+    chunks = list(archive.iter_core_chunks(
+        fieldnames=["year", "occurrenceID"], chunksize=2))
+    assert([len(chunk) for chunk in chunks] == [2, 1])
+    for chunk in chunks:
+        assert(chunk.columns.tolist() == ["occurrenceID", "year"])
+    records = [rec for chunk in chunks for rec in chunk.to_dict(orient="records")]
+    assert(records == [
+        {"occurrenceID": "a1", "year": "2001"},
+        {"occurrenceID": "a2", "year": "1999"},
+        {"occurrenceID": "a3", "year": ""}])
+
+    # All fields, with empty values as empty strings
+    chunks = list(archive.iter_core_chunks())
+    assert(len(chunks) == 1)
+    assert(chunks[0].columns.tolist() == ["occurrenceID", "institutionCode", "year"])
+    assert(chunks[0]["institutionCode"].tolist() == ["KU", "", "UF"])
+
+
+# ...............................................
+class _FakeResponse:
+    # Streamed response returning zip bytes, or an HTTP error status
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self._content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self._content), chunk_size):
+            yield self._content[start:start + chunk_size]
+
+
+# ...............................................
+def _fake_get(url, stream=False, timeout=None):
+    # Succeed for ok archives, return a missing status or fail to connect otherwise
+    name = url.rpartition("/")[2]
+    if name.startswith("ok"):
+        return _FakeResponse(200, content=b"PK" + name.encode())
+    elif name.startswith("missing"):
+        return _FakeResponse(404)
+    raise requests.ConnectionError(f"Cannot connect to {url}")
+
+
+# ............................
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_download_dwcas_records_failures(tmp_path, monkeypatch, max_workers):
+    """Record a filename for each download, or None for each failure."""
+    monkeypatch.setattr("sppy.tools.util.dwca.requests.get", _fake_get)
+    baseoutpath = str(tmp_path)
+    # An existing directory in place of the file cannot be replaced
+    os.makedirs(os.path.join(baseoutpath, "blocked", "blocked.zip"))
+    datasets = {
+        "ok": {"url": f"{BASE_URL}/ok.zip"},
+        "missing": {"url": f"{BASE_URL}/missing.zip"},
+        "down": {"url": f"{BASE_URL}/down.zip"},
+        "blocked": {"url": f"{BASE_URL}/blocked.zip"},
+        "no_url": {"title": "No archive"},
+    }
+
+    datasets = download_dwcas(
+        datasets, baseoutpath, overwrite=True, max_workers=max_workers)
+
+    ok_fname = datasets["ok"]["filename"]
+    assert(ok_fname == assemble_download_filename(f"{BASE_URL}/ok.zip", baseoutpath))
+    with open(ok_fname, "rb") as f:
+        assert(f.read() == b"PKok.zip")
+    for key in ("missing", "down", "blocked"):
+        assert(datasets[key]["filename"] is None)
+    assert(not os.path.exists(
+        assemble_download_filename(f"{BASE_URL}/down.zip", baseoutpath)))
+    assert("filename" not in datasets["no_url"])
+
+
 # ...............................................
 def _clear_data(path_to_delete):
     # Delete a file or recursively delete a directory.
@@ -124,7 +291,8 @@ def _clear_data(path_to_delete):
     fileinfo[DWCA.DELIMITER_KEY] = core_elt.attrib[DWCA.DELIMITER_KEY]
     fileinfo[DWCA.LINE_DELIMITER_KEY] = core_elt.attrib[DWCA.LINE_DELIMITER_KEY]
     fileinfo[DWCA.QUOTE_CHAR_KEY] = core_elt.attrib[DWCA.QUOTE_CHAR_KEY]
-    fileinfo["fieldname_index_map"] = field_idxs
+    fileinfo["fieldname_index_map"] = term_to_idx
+    fileinfo["index_fieldname_map"] = idx_to_term
     fileinfo["fieldnames"] = ordered_fldnames
     """
 
@@ -0,0 +1 @@
+"""Test package for sppy tools."""
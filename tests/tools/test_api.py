@@ -0,0 +1,58 @@
+"""Functions to test sppy.tools.provider.api.APIQuery posting files."""
+from http import HTTPStatus
+import pytest
+import requests
+
+from sppy.tools.provider.api import APIQuery
+
+BASE_URL = "https://example.org/solr/update"
+
+
+# ...............................................
+class _FakeResponse:
+    # Response to a post, with JSON output for a successful status
+    def __init__(self, status_code, output=None):
+        self.status_code = status_code
+        self.reason = HTTPStatus(status_code).phrase
+        self.ok = status_code < 400
+        self._output = output
+
+    def json(self):
+        return self._output
+
+
+# ...............................................
+class _FakeSession:
+    # Accept posts of files whose contents start with "ok", fail to connect for
+    #   "down", and return a server error otherwise
+    def post(self, url, files=None, headers=None):
+        content = files["files"].read()
+        if content.startswith(b"ok"):
+            return _FakeResponse(HTTPStatus.OK, output={"posted": content.decode()})
+        elif content.startswith(b"down"):
+            raise requests.ConnectionError(f"Cannot connect to {url}")
+        return _FakeResponse(HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+# ............................
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_post_files(tmp_path, monkeypatch, max_workers):
+    """Each file is posted, with the result or error of each recorded separately."""
+    monkeypatch.setattr("sppy.tools.provider.api._SESSION", _FakeSession())
+    filenames = []
+    for content in ("ok_1", "ok_2", "down", "bad"):
+        fname = tmp_path / f"{content}.csv"
+        fname.write_text(content)
+        filenames.append(str(fname))
+
+    queries = APIQuery.post_files(BASE_URL, filenames, max_workers=max_workers)
+
+    assert(list(queries.keys()) == filenames)
+    for fname, content in zip(filenames[:2], ("ok_1", "ok_2")):
+        assert(queries[fname].status_code == HTTPStatus.OK)
+        assert(queries[fname].output == {"posted": content})
+        assert(queries[fname].error is None)
+    for fname in filenames[2:]:
+        assert(queries[fname].status_code == HTTPStatus.INTERNAL_SERVER_ERROR)
+        assert(queries[fname].output is None)
+        assert(queries[fname].error is not None)
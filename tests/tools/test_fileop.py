@@ -0,0 +1,53 @@
+"""Functions to test sppy.tools.util.fileop batch CSV readers with ragged rows."""
+import pandas as pd
+import pytest
+
+from sppy.tools.util.fileop import get_arrow_csv_reader, get_csv_batch_reader
+
+FIELDNAMES = ["a", "b", "c"]
+# One short record, one long record, and one with empty trailing values
+RAGGED_LINES = [
+    "a\tb\tc", "1\t2\t3", "4\t5", "6\t7\t8\t9", "10\t\t", "11\t12\t13"]
+EXPECTED_RECORDS = [
+    {"a": "1", "b": "2", "c": "3"},
+    {"a": "10", "b": "", "c": ""},
+    {"a": "11", "b": "12", "c": "13"}]
+
+
+# ...............................................
+def _write_ragged_file(tmp_path):
+    # Write a tab-delimited file with a header and ragged records
+    datafile = tmp_path / "ragged.txt"
+    datafile.write_text("\n".join(RAGGED_LINES) + "\n", encoding="utf-8")
+    return str(datafile)
+
+
+# ............................
+def test_arrow_reader_skips_ragged_rows(tmp_path):
+    """Records with too few or too many values are skipped with a warning."""
+    datafile = _write_ragged_file(tmp_path)
+    # The reader parses the first block when it is opened
+    with pytest.warns(pd.errors.ParserWarning) as record:
+        reader, f = get_arrow_csv_reader(datafile, "\t", "utf-8")
+        with f:
+            recs = [rec for batch in reader for rec in batch.to_pylist()]
+
+    assert(recs == EXPECTED_RECORDS)
+    assert(len(record) == 2)
+
+
+# ............................
+def test_batch_reader_skips_ragged_rows(tmp_path):
+    """The batch reader skips the same records as the arrow reader."""
+    datafile = _write_ragged_file(tmp_path)
+    with pytest.warns(pd.errors.ParserWarning) as record:
+        reader, f = get_csv_batch_reader(datafile, "\t", "utf-8", chunksize=2)
+        with f:
+            chunks = list(reader)
+
+    assert([len(chunk) for chunk in chunks] == [2, 1])
+    dataframe = pd.concat(chunks)
+    assert(dataframe.columns.tolist() == FIELDNAMES)
+    assert(dataframe.index.tolist() == [0, 1, 2])
+    assert(dataframe.to_dict(orient="records") == EXPECTED_RECORDS)
+    assert(len(record) == 2)
@@ -0,0 +1,47 @@
+"""Functions to test sppy.tools.util.logtools.Logger."""
+import threading
+
+from sppy.tools.util.logtools import Logger
+
+
+# ............................
+def test_flush_writes_log_file(tmp_path):
+    """Messages are in the log file after flush, and close can be called again."""
+    logger = Logger("test_flush", log_path=str(tmp_path), log_console=False)
+    for i in range(100):
+        logger.log(f"message {i}", refname="test")
+    logger.flush()
+
+    with open(logger.filename, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    assert(len(lines) == 100)
+    assert(lines[-1].rstrip().endswith("test: message 99"))
+
+    logger.close()
+    logger.close()
+
+
+# ............................
+def test_concurrent_flush_and_close(tmp_path):
+    """Flushing and closing from several threads at once does not raise."""
+    logger = Logger("test_concurrent", log_path=str(tmp_path), log_console=False)
+    logger.log("before close", refname="test")
+    errors = []
+
+    def _flush_and_close():
+        try:
+            logger.flush()
+            logger.close()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_flush_and_close) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert(errors == [])
+
+    with open(logger.filename, "r", encoding="utf-8") as f:
+        text = f.read()
+    assert("test: before close" in text)
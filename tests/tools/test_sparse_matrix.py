@@ -0,0 +1,88 @@
+"""Functions to test sppy.tools.s2n.sparse_matrix.SparseMatrix with small matrices."""
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse
+
+from sppy.tools.s2n.constants import SNKeys, SUMMARY_TABLE_TYPES
+from sppy.tools.s2n.sparse_matrix import SparseMatrix
+
+DATA_DATESTR = "2024_01_01"
+
+
+# ...............................................
+def _make_matrix(data, rows, cols, shape, dtype):
+    # Build a SparseMatrix from COO values and coordinates, with generic labels
+    coo = scipy.sparse.coo_array(
+        (np.array(data, dtype=dtype), (np.array(rows), np.array(cols))), shape=shape)
+    row_categ = pd.CategoricalDtype(
+        [f"r{i}" for i in range(shape[0])], ordered=True)
+    col_categ = pd.CategoricalDtype(
+        [f"c{i}" for i in range(shape[1])], ordered=True)
+    sp_mtx = SparseMatrix(
+        coo, SUMMARY_TABLE_TYPES.SPECIES_DATASET_MATRIX, DATA_DATESTR, row_categ,
+        col_categ)
+    return sp_mtx
+
+
+# ............................
+def test_totals_of_narrow_integers():
+    """Totals of a small integer matrix do not overflow its dtype."""
+    sp_mtx = _make_matrix([200, 100], [0, 1], [0, 0], (2, 2), np.uint8)
+
+    totals = sp_mtx.get_totals(axis=0)
+    assert(totals.tolist() == [300, 0])
+    assert(totals.tolist() == sp_mtx._coo_array.sum(axis=0).tolist())
+
+    totals, counts = sp_mtx.get_totals_and_counts(axis=0)
+    assert(totals.tolist() == [300, 0])
+    assert(counts.tolist() == [2, 0])
+
+    totals = sp_mtx.get_totals(axis=1)
+    assert(totals.tolist() == [200, 100])
+
+
+# ............................
+def test_row_stats_labels_without_datasets():
+    """Max labels of a row stay a list when columns are not datasets."""
+    sp_mtx = _make_matrix([3, 5, 5], [0, 0, 0], [0, 1, 2], (2, 3), np.int32)
+    sp_mtx._table["column"] = "measurement_type"
+
+    stats = sp_mtx.get_one_row_stats("r0")
+    assert(stats[sp_mtx._keys[SNKeys.ROW_MAX_TOTAL_LABELS]] == ["c1", "c2"])
+
+    stats = sp_mtx.get_all_column_stats()
+    assert(stats[sp_mtx._keys[SNKeys.COLS_MAX_TOTAL_LABELS]] == ["c1", "c2"])
+
+
+# ............................
+def test_row_stats_labels_with_datasets(monkeypatch):
+    """Max labels of a row map to dataset names when columns are datasets."""
+    class _FakeSpNet:
+        def __init__(self, bucket):
+            pass
+
+        def lookup_dataset_names(self, labels):
+            return {lbl: (None if lbl == "c2" else f"name_{lbl}") for lbl in labels}
+
+    monkeypatch.setattr(
+        "sppy.tools.s2n.sparse_matrix.SpNetAnalyses", _FakeSpNet)
+    sp_mtx = _make_matrix([3, 5, 5], [0, 0, 0], [0, 1, 2], (2, 3), np.int32)
+
+    stats = sp_mtx.get_one_row_stats("r0")
+    assert(
+        stats[sp_mtx._keys[SNKeys.ROW_MAX_TOTAL_LABELS]] ==
+        {"c1": "name_c1", "c2": "c2"})
+
+
+# ............................
+def test_metadata_is_not_shared():
+    """Callers cannot change table metadata or statistics keys of other matrices."""
+    sp_mtx = _make_matrix([1], [0], [0], (1, 1), np.int32)
+    table_meta = sp_mtx.table_meta
+    table_meta["row_summary_table"] = None
+    assert(sp_mtx.table_meta["row_summary_table"] is not None)
+
+    keys = SNKeys.get_keys_for_table(SUMMARY_TABLE_TYPES.SPECIES_DATASET_MATRIX)
+    with pytest.raises(TypeError):
+        keys[SNKeys.ROW_LABEL] = "changed"
@@ -0,0 +1,111 @@
+"""Functions to test sppy.tools.s2n.summary_matrix.SummaryMatrix with small tables."""
+import numpy as np
+import os
+import pytest
+from zipfile import ZipFile
+
+from sppy.tools.s2n.constants import SUMMARY_FIELDS, SUMMARY_TABLE_TYPES
+from sppy.tools.s2n.summary_matrix import SummaryMatrix, _top_k_positions
+
+DATA_DATESTR = "2024_01_01"
+
+
+# ...............................................
+def _make_summary(counts, totals, dtype):
+    # Build a SummaryMatrix from counts and totals, with generic labels
+    labels = [f"r{i}" for i in range(len(counts))]
+    summary_mtx = SummaryMatrix.init_from_arrays(
+        np.array(counts, dtype=dtype), np.array(totals, dtype=dtype), labels,
+        SUMMARY_TABLE_TYPES.DATASET_SPECIES_SUMMARY, DATA_DATESTR)
+    return summary_mtx
+
+
+# ............................
+def test_top_k_positions_unsigned_with_zeros():
+    """Zeros in an unsigned array rank as the smallest values, not the largest."""
+    vals = np.array([0, 5, 3, 5, 0, 7, 3], dtype=np.uint64)
+
+    assert(_top_k_positions(vals, 3).tolist() == [5, 1, 3])
+    assert(_top_k_positions(vals, 10).tolist() == [5, 1, 3, 2, 6, 0, 4])
+    assert(_top_k_positions(vals, 3, descending=False).tolist() == [0, 4, 2, 6])
+    assert(
+        _top_k_positions(vals, 10, descending=False).tolist() ==
+        [0, 4, 2, 6, 1, 3, 5])
+
+
+# ............................
+def test_rank_measures_unsigned_with_zeros():
+    """Ranking unsigned totals puts zero totals last."""
+    summary_mtx = _make_summary(
+        [0, 2, 1, 2, 0, 3, 1], [0, 5, 3, 5, 0, 7, 3], np.uint32)
+
+    ranked = summary_mtx.rank_measures(SUMMARY_FIELDS.TOTAL, limit=3)
+    assert(list(ranked.keys()) == ["r5", "r1", "r3"])
+    assert(ranked["r5"][SUMMARY_FIELDS.TOTAL] == 7)
+
+    ranked = summary_mtx.rank_measures(SUMMARY_FIELDS.TOTAL, limit=10)
+    assert(list(ranked.keys())[-2:] == ["r0", "r4"])
+
+
+# ............................
+def test_uncompress_parquet_and_csv(tmp_path):
+    """Summary archives read from a parquet member or an older CSV member."""
+    summary_mtx = _make_summary([2, 1], [5, 3], np.int64)
+    zip_fname = summary_mtx.compress_to_file(local_path=str(tmp_path))
+
+    dataframe, _meta_dict, _table_type, data_datestr = \
+        SummaryMatrix.uncompress_zipped_data(
+            zip_fname, local_path=str(tmp_path), overwrite=True)
+    assert(data_datestr == DATA_DATESTR)
+    assert(dataframe[SUMMARY_FIELDS.TOTAL].tolist() == [5, 3])
+
+    # Rewrite the archive with the matrix as CSV, as in older published archives
+    fname = os.path.splitext(os.path.basename(zip_fname))[0]
+    csv_path = tmp_path / "csv"
+    csv_path.mkdir()
+    with ZipFile(zip_fname, "r") as archive:
+        meta_json = archive.read(f"{fname}.json")
+    csv_zip_fname = str(csv_path / f"{fname}.zip")
+    with ZipFile(csv_zip_fname, "w") as archive:
+        archive.writestr(f"{fname}.csv", summary_mtx._df.to_csv())
+        archive.writestr(f"{fname}.json", meta_json)
+
+    dataframe, _meta_dict, _table_type, _data_datestr = \
+        SummaryMatrix.uncompress_zipped_data(
+            csv_zip_fname, local_path=str(csv_path), overwrite=True)
+    assert(dataframe.index.tolist() == ["r0", "r1"])
+    assert(dataframe[SUMMARY_FIELDS.TOTAL].tolist() == [5, 3])
+
+
+# ............................
+@pytest.mark.parametrize("order", ["descending", "ascending"])
+@pytest.mark.parametrize("sort_by", [SUMMARY_FIELDS.COUNT, SUMMARY_FIELDS.TOTAL])
+@pytest.mark.parametrize("limit", [1, 2, 3, 5, 20])
+def test_rank_measures_matches_pandas(order, sort_by, limit):
+    """Ranked records, with ties, match pandas nlargest/nsmallest(keep="all").
+
+    Note:
+        pandas sorts all values without a stable sort when limit covers them all, so
+            ties are ordered by a stable sort of the records nlargest/nsmallest select.
+    """
+    counts = [3, 1, 3, 2, 1, 3, 2, 1, 4, 2]
+    totals = [30, 10, 25, 30, 10, 40, 20, 5, 40, 30]
+    summary_mtx = _make_summary(counts, totals, np.int64)
+    sdf = summary_mtx._df
+    if order == "descending":
+        selected_df = sdf.nlargest(limit, sort_by, keep="all")
+    else:
+        selected_df = sdf.nsmallest(limit, sort_by, keep="all")
+    expected_df = sdf.loc[sdf.index.isin(selected_df.index)].sort_values(
+        sort_by, ascending=(order == "ascending"), kind="stable")
+    other_fld = [fld for fld in sdf.columns if fld != sort_by][0]
+
+    ranked = summary_mtx.rank_measures(sort_by, order=order, limit=limit)
+    assert(list(ranked.keys()) == expected_df.index.tolist())
+    assert(
+        [rec[sort_by] for rec in ranked.values()] == selected_df[sort_by].tolist())
+    for label, rec in ranked.items():
+        # The sort field is first, then the other measurement
+        assert(list(rec.keys()) == [sort_by, other_fld])
+        assert(rec[sort_by] == expected_df.loc[label, sort_by])
+        assert(rec[other_fld] == expected_df.loc[label, other_fld])
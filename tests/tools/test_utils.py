@@ -0,0 +1,48 @@
+"""Functions to test sppy.tools.util.utils UUID validation."""
+import numpy as np
+import pandas as pd
+
+from sppy.tools.util.utils import get_valid_uuid_mask, is_valid_uuid
+
+VALID_UUID = "c9bf9e57-1685-4c89-bafb-ff5af830be8a"
+
+
+# ............................
+def test_valid_uuid_mask_of_strings():
+    """A Series of strings gives a boolean Series matching is_valid_uuid."""
+    values = [VALID_UUID, VALID_UUID.upper(), "c9bf9e58", None, 3]
+    uuids = pd.Series(values, index=[10, 11, 12, 13, 14])
+
+    valid_mask = get_valid_uuid_mask(uuids)
+    assert(valid_mask.dtype == bool)
+    assert(valid_mask.index.tolist() == [10, 11, 12, 13, 14])
+    assert(valid_mask.tolist() == [is_valid_uuid(val) for val in values])
+    assert(get_valid_uuid_mask(uuids, version=3).tolist() == [False] * 5)
+
+
+# ............................
+def test_valid_uuid_mask_without_strings():
+    """Numeric and categorical Series give an aligned boolean Series."""
+    numbers = pd.Series([1, 2], index=["a", "b"])
+    valid_mask = get_valid_uuid_mask(numbers)
+    assert(valid_mask.dtype == bool)
+    assert(valid_mask.index.tolist() == ["a", "b"])
+    assert(valid_mask.tolist() == [False, False])
+
+    categories = pd.Series([VALID_UUID, "x", VALID_UUID], dtype="category")
+    valid_mask = get_valid_uuid_mask(categories)
+    assert(valid_mask.dtype == bool)
+    assert(valid_mask.tolist() == [True, False, True])
+
+    valid_mask = get_valid_uuid_mask(pd.Series([1.5, 2.0], dtype="category"))
+    assert(valid_mask.dtype == bool)
+    assert(valid_mask.tolist() == [False, False])
+
+
+# ............................
+def test_valid_uuid_mask_of_list():
+    """Other iterables give a boolean array in the same order."""
+    valid_mask = get_valid_uuid_mask([VALID_UUID, "x", 3])
+    assert(isinstance(valid_mask, np.ndarray))
+    assert(valid_mask.dtype == bool)
+    assert(valid_mask.tolist() == [True, False, False])